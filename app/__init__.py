@@ -11,6 +11,14 @@ load_dotenv('.flaskenv')
 
 app = Flask(__name__, instance_relative_config=True)
 
+# Use orjson for jsonify() and request.get_json()
+from app.json_provider import OrjsonProvider
+app.json_provider_class = OrjsonProvider
+app.json = OrjsonProvider(app)
+# Emit keys in insertion order; sorting every dict costs time on large payloads
+# and no client depends on alphabetized keys. Output is indented in debug only.
+app.json.sort_keys = False
+
 # Set maximum content length for incoming requests (16MB)
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024
 
@@ -20,6 +28,16 @@ app.config['CORE_SERVICE_URL'] = os.environ.get('CORE_SERVICE_URL')
 app.config['SERVICE_NAME'] = os.environ.get('SERVICE_NAME', 'brainhair')
 app.config['HELM_SERVICE_URL'] = os.environ.get('HELM_SERVICE_URL', 'http://localhost:5004')
 
+# Number of worker processes for Presidio filtering. 0 (default) filters in the
+# request thread; set to the number of physical cores to spread large payloads
+# across CPUs. Each worker loads its own copy of the spaCy model.
+app.config['PRESIDIO_WORKERS'] = int(os.environ.get('PRESIDIO_WORKERS', '0'))
+
+# Optional Redis URL (e.g. redis://localhost:6379/2) for the proxy and Presidio
+# response caches, so gunicorn workers and replicas share cache hits. Requires
+# the redis package; unset keeps the caches in-process.
+app.config['RESPONSE_CACHE_URL'] = os.environ.get('RESPONSE_CACHE_URL')
+
 if not app.config['CORE_SERVICE_URL']:
     raise ValueError("CORE_SERVICE_URL must be set in the .flaskenv file.")
 
@@ -72,13 +90,26 @@ db.init_app(app)
 from flask_limiter import Limiter
 from app.rate_limit_key import get_user_id_or_ip
 
+# Set RATELIMIT_STORAGE_URI to a redis:// URL so all gunicorn workers share
+# one set of counters; the in-process default gives each worker its own.
+# If Redis becomes unreachable, limits fall back to in-memory counters.
 limiter = Limiter(
     app=app,
     key_func=get_user_id_or_ip,  # Per-user rate limiting
     default_limits=["10000 per hour", "500 per minute"],
-    storage_uri="memory://"
+    storage_uri=os.environ.get('RATELIMIT_STORAGE_URI', 'memory://'),
+    in_memory_fallback_enabled=True
 )
 
+# Compress JSON/HTML responses of 1 KB or more with the best codec the client
+# accepts. Streamed chat responses are left uncompressed so each event is
+# flushed to the client as soon as it is produced.
+from flask_compress import Compress
+app.config['COMPRESS_ALGORITHM'] = ['zstd', 'br', 'gzip']
+app.config['COMPRESS_MIN_SIZE'] = 1024
+app.config['COMPRESS_STREAMS'] = False
+Compress(app)
+
 # Load services configuration from services.json (for service-to-service calls)
 try:
     with open('services.json') as f:
@@ -134,6 +165,7 @@ from app.error_responses import (
     internal_server_error,
     not_found,
     bad_request,
+    rate_limit_exceeded,
     unauthorized,
     forbidden,
     service_unavailable
@@ -159,6 +191,11 @@ def handle_not_found(e):
     """Handle 404 Not Found errors"""
     return not_found(detail=str(e))
 
+@app.errorhandler(429)
+def handle_rate_limit_exceeded(e):
+    """Handle 429 Too Many Requests (Flask-Limiter)"""
+    return rate_limit_exceeded(detail=e.description)
+
 @app.errorhandler(500)
 def handle_internal_error(e):
     """Handle 500 Internal Server Error"""
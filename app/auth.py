@@ -1,10 +1,19 @@
 from functools import wraps
 from flask import request, g, current_app, abort
 import jwt
+import time
+
+from .response_cache import TTLCache
 
 # Cache for Core's public key
 jwks_client = None
 
+# Verified token claims keyed by the raw token. Agents send the same bearer
+# token on every call, so this skips the RS256 signature check on repeat
+# requests. Entries never outlive the token's own 'exp'.
+VERIFIED_TOKEN_TTL = 60
+_verified_tokens = TTLCache(maxsize=1024, ttl=VERIFIED_TOKEN_TTL)
+
 def allow_localhost(f):
     """
     A decorator that allows requests from localhost without auth.
@@ -32,14 +41,7 @@ def allow_localhost(f):
         token = auth_header.split(' ')[1]
 
         try:
-            signing_key = jwks_client.get_signing_key_from_jwt(token)
-            data = jwt.decode(
-                token,
-                signing_key.key,
-                algorithms=["RS256"],
-                issuer="hivematrix-core",
-                options={"verify_exp": True}
-            )
+            data = decode_token(token)
 
             # Determine if this is a user token or service token
             if data.get('type') == 'service':
@@ -61,6 +63,39 @@ def allow_localhost(f):
 
     return decorated_function
 
+def decode_token(token: str) -> dict:
+    """
+    Verify a Core-issued JWT and return its claims.
+
+    Claims are cached for up to VERIFIED_TOKEN_TTL seconds (never past the
+    token's expiry), so repeat requests with the same token skip signature
+    verification.
+
+    Args:
+        token: Raw bearer token
+
+    Returns:
+        Decoded claims (a copy, safe to store on g)
+
+    Raises:
+        jwt.PyJWTError: If the token is invalid or expired
+    """
+    data = _verified_tokens.get(token)
+    if data is None:
+        signing_key = jwks_client.get_signing_key_from_jwt(token)
+        data = jwt.decode(
+            token,
+            signing_key.key,
+            algorithms=["RS256"],
+            issuer="hivematrix-core",
+            options={"verify_exp": True}
+        )
+        ttl = min(VERIFIED_TOKEN_TTL, data.get('exp', 0) - time.time())
+        if ttl > 0:
+            _verified_tokens.set(token, data, ttl=ttl)
+
+    return dict(data)
+
 def init_jwks_client():
     """Initializes the JWKS client from the URL in config."""
     global jwks_client
@@ -86,14 +121,7 @@ def token_required(f):
         token = auth_header.split(' ')[1]
 
         try:
-            signing_key = jwks_client.get_signing_key_from_jwt(token)
-            data = jwt.decode(
-                token,
-                signing_key.key,
-                algorithms=["RS256"],
-                issuer="hivematrix-core",
-                options={"verify_exp": True}
-            )
+            data = decode_token(token)
 
             # Determine if this is a user token or service token
             if data.get('type') == 'service':
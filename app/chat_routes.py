@@ -4,13 +4,13 @@ Chat routes for Brain Hair AI Assistant
 Handles chat interface, Claude Code integration, and command approval workflow.
 """
 
-from flask import render_template, request, jsonify, g, Response, stream_with_context
+from flask import request, jsonify, g
 from app import app, limiter
+from .error_responses import internal_error_json
 from .auth import token_required
 from .service_client import call_service
 from .helm_logger import get_helm_logger
 from .claude_session_manager import get_session_manager
-from .presidio_filter import get_presidio_filter
 import json
 import uuid
 import time
@@ -31,9 +31,12 @@ pending_approvals = {}
 # Get the global session manager
 session_manager = get_session_manager()
 
+# Helm logger is initialized in app/__init__.py before routes are imported
+logger = get_helm_logger()
+
 
 # Import the new company-based filtering function
-from .routes import apply_company_filtering
+from .routes import apply_company_filtering, render_user_page
 
 
 @app.route('/chat')
@@ -42,8 +45,6 @@ def chat_interface():
     """
     Render the chat interface.
     """
-    logger = get_helm_logger()
-
     # Prevent service calls from accessing UI
     if g.is_service_call:
         return jsonify({'error': 'This endpoint is for users only'}), 403
@@ -51,7 +52,7 @@ def chat_interface():
     user = g.user
     logger.info(f"User {user.get('preferred_username')} accessed chat interface")
 
-    return render_template('chat.html', user=user)
+    return render_user_page('chat.html')
 
 
 # Store for polling-based responses
@@ -77,8 +78,6 @@ def chat_message():
     Starts Claude Code in background and returns a response_id.
     Client polls /api/chat/poll/<response_id> for updates.
     """
-    logger = get_helm_logger()
-
     try:
         data = request.get_json()
         message = data.get('message', '')
@@ -156,7 +155,7 @@ def chat_message():
 
     except Exception as e:
         logger.error(f"Chat error: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return internal_error_json()
 
 
 @app.route('/api/chat/poll/<response_id>', methods=['GET'])
@@ -174,7 +173,6 @@ def poll_response(response_id):
     db_session_id = buffer.get('db_session_id')
 
     # Check for approval request files and inject them into the stream
-    logger = get_helm_logger()
     if db_session_id:
         # Validate session ID format to prevent path traversal
         import re
@@ -198,7 +196,7 @@ def poll_response(response_id):
                     logger.error(f"Error reading approval file {approval_file}: {e}")
 
     # Get the offset parameter (how many chunks client already has)
-    offset = int(request.args.get('offset', 0))
+    offset = request.args.get('offset', 0, type=int)
 
     # Return new chunks since offset
     new_chunks = buffer['chunks'][offset:]
@@ -224,8 +222,6 @@ def stop_response(response_id):
     """Stop a running Claude Code response."""
     from app.chat_routes import session_manager
 
-    logger = get_helm_logger()
-
     try:
         # Check if response exists
         if response_id not in response_buffers:
@@ -257,7 +253,7 @@ def stop_response(response_id):
 
     except Exception as e:
         logger.error(f"Error stopping response: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return internal_error_json()
 
 
 def build_context(ticket: Optional[str], client: Optional[str], user: str) -> Dict:
@@ -400,8 +396,6 @@ def approve_command():
         "output": "command output"
     }
     """
-    logger = get_helm_logger()
-
     try:
         data = request.get_json()
         command_id = data.get('command_id')
@@ -431,7 +425,7 @@ def approve_command():
 
     except Exception as e:
         logger.error(f"Command approval error: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return internal_error_json()
 
 
 @app.route('/api/chat/command/deny', methods=['POST'])
@@ -445,8 +439,6 @@ def deny_command():
         "command_id": "uuid"
     }
     """
-    logger = get_helm_logger()
-
     try:
         data = request.get_json()
         command_id = data.get('command_id')
@@ -471,7 +463,7 @@ def deny_command():
 
     except Exception as e:
         logger.error(f"Command denial error: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return internal_error_json()
 
 
 def execute_remote_command(device_id: str, command: str) -> str:
@@ -491,7 +483,6 @@ def execute_remote_command(device_id: str, command: str) -> str:
     # NOTE: Datto RMM integration not yet implemented (see main TODO list)
     # Currently returns simulated output
 
-    logger = get_helm_logger()
     logger.info(f"Simulated command execution on device {device_id}: {command}")
 
     return f"""Simulated output for: {command}
@@ -512,15 +503,13 @@ def destroy_session(session_id: str):
 
     Used when the user closes the chat or logs out.
     """
-    logger = get_helm_logger()
-
     try:
         session_manager.destroy_session(session_id)
         logger.info(f"Destroyed session {session_id}")
         return jsonify({'status': 'destroyed'})
     except Exception as e:
         logger.error(f"Error destroying session: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return internal_error_json()
 
 
 @app.route('/api/command/<command_id>/status', methods=['GET'])
@@ -531,8 +520,6 @@ def get_command_status(command_id: str):
 
     This endpoint tracks the status of remote device commands pending approval.
     """
-    logger = get_helm_logger()
-
     try:
         command = pending_commands.get(command_id)
 
@@ -556,7 +543,7 @@ def get_command_status(command_id: str):
 
     except Exception as e:
         logger.error(f"Error getting command status: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return internal_error_json()
 
 
 # ==================== Chat History Endpoints ====================
@@ -575,8 +562,6 @@ def list_chat_sessions():
     """
     from models import ChatSession as ChatSessionModel
 
-    logger = get_helm_logger()
-
     try:
         user = g.user
         user_id = user.get('preferred_username')
@@ -594,8 +579,8 @@ def list_chat_sessions():
             query = query.filter(ChatSessionModel.client_name.ilike(f'%{client}%'))
 
         # Pagination
-        limit = min(int(request.args.get('limit', 50)), 100)
-        offset = int(request.args.get('offset', 0))
+        limit = min(request.args.get('limit', 50, type=int), 100)
+        offset = request.args.get('offset', 0, type=int)
 
         # Order by most recent first
         query = query.order_by(ChatSessionModel.updated_at.desc())
@@ -617,7 +602,7 @@ def list_chat_sessions():
 
     except Exception as e:
         logger.error(f"Error listing chat sessions: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return internal_error_json()
 
 
 @app.route('/api/chat/history/<session_id>', methods=['GET'])
@@ -628,8 +613,6 @@ def get_chat_session(session_id):
     """
     from models import ChatSession as ChatSessionModel
 
-    logger = get_helm_logger()
-
     try:
         user = g.user
         user_id = user.get('preferred_username')
@@ -655,7 +638,7 @@ def get_chat_session(session_id):
 
     except Exception as e:
         logger.error(f"Error getting chat session: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return internal_error_json()
 
 
 @app.route('/api/chat/history/search', methods=['GET'])
@@ -671,8 +654,6 @@ def search_chat_history():
     """
     from models import ChatSession as ChatSessionModel, ChatMessage
 
-    logger = get_helm_logger()
-
     try:
         user = g.user
         user_id = user.get('preferred_username')
@@ -704,7 +685,7 @@ def search_chat_history():
         query = query.distinct()
 
         # Limit results
-        limit = min(int(request.args.get('limit', 20)), 50)
+        limit = min(request.args.get('limit', 20, type=int), 50)
         sessions = query.limit(limit).all()
 
         logger.info(f"Found {len(sessions)} sessions matching '{query_text}' for user {user_id}")
@@ -717,7 +698,7 @@ def search_chat_history():
 
     except Exception as e:
         logger.error(f"Error searching chat history: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return internal_error_json()
 
 
 @app.route('/api/chat/session/<session_id>/title', methods=['PUT'])
@@ -732,8 +713,6 @@ def update_session_title(session_id):
     from models import ChatSession as ChatSessionModel
     from extensions import db
 
-    logger = get_helm_logger()
-
     try:
         # Get request data
         data = request.get_json()
@@ -774,7 +753,7 @@ def update_session_title(session_id):
 
     except Exception as e:
         logger.error(f"Error updating session title: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return internal_error_json()
 
 
 # ============================================================
@@ -792,8 +771,6 @@ def create_approval_request():
         - action: Description of the action (e.g., "Update billing")
         - details: Dict with details to show user
     """
-    logger = get_helm_logger()
-
     try:
         data = request.get_json()
         session_id = data.get('session_id')
@@ -822,7 +799,7 @@ def create_approval_request():
 
     except Exception as e:
         logger.error(f"Error creating approval request: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return internal_error_json()
 
 
 @app.route('/api/approval/poll/<approval_id>', methods=['GET'])
@@ -872,8 +849,6 @@ def respond_to_approval(approval_id):
     Body:
         - approved: true/false
     """
-    logger = get_helm_logger()
-
     try:
         data = request.get_json()
         approved = data.get('approved', False)
@@ -898,4 +873,4 @@ def respond_to_approval(approval_id):
 
     except Exception as e:
         logger.error(f"Error responding to approval: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return internal_error_json()
@@ -12,6 +12,7 @@ import subprocess
 import json
 import uuid
 import os
+import sys
 import time
 from datetime import datetime
 from typing import Dict, Optional, Callable
@@ -19,6 +20,9 @@ from flask import current_app
 from .helm_logger import get_helm_logger
 from .presidio_filter import filter_data
 
+# Assistant tool modules, imported by the demo fallback responses
+CLAUDE_TOOLS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'claude_tools')
+
 
 def _get_user_display_name(user_id: str) -> str:
     """
@@ -561,8 +565,8 @@ class ClaudeSession:
         # Try to call the Python tools to demonstrate they work
         if 'compan' in msg_lower and 'list' in msg_lower:
             try:
-                import sys
-                sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'claude_tools'))
+                if CLAUDE_TOOLS_DIR not in sys.path:
+                    sys.path.insert(0, CLAUDE_TOOLS_DIR)
                 from codex_tools import get_companies
 
                 companies = get_companies(limit=5)
@@ -576,8 +580,8 @@ class ClaudeSession:
 
         elif 'ticket' in msg_lower and 'list' in msg_lower:
             try:
-                import sys
-                sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'claude_tools'))
+                if CLAUDE_TOOLS_DIR not in sys.path:
+                    sys.path.insert(0, CLAUDE_TOOLS_DIR)
                 from codex_tools import get_tickets
 
                 tickets = get_tickets(limit=5)
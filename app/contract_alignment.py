@@ -6,6 +6,7 @@ billing settings to match contract terms.
 """
 
 from .ledger_client import get_ledger_client
+from .service_client import fan_out
 from .helm_logger import get_helm_logger
 from typing import Dict, List, Any, Optional
 import re
@@ -42,9 +43,11 @@ class ContractAlignmentTool:
         """
         self.logger.info(f"Analyzing contract for account {account_number}")
 
-        # Get current billing settings
-        current_billing = self.ledger.get_billing_for_client(account_number)
-        current_overrides = self.ledger.get_client_overrides(account_number)
+        # Get current billing settings (independent Ledger reads, fetched concurrently)
+        current_billing, current_overrides = fan_out(
+            lambda: self.ledger.get_billing_for_client(account_number),
+            lambda: self.ledger.get_client_overrides(account_number),
+        )
 
         return {
             'account_number': account_number,
@@ -66,12 +69,19 @@ class ContractAlignmentTool:
         """
         self.logger.info(f"Fetching current settings for {account_number}")
 
-        billing_data = self.ledger.get_billing_for_client(account_number)
-        overrides = self.ledger.get_client_overrides(account_number)
-        plans = self.ledger.get_billing_plans()
-        manual_assets = self.ledger.get_manual_assets(account_number)
-        manual_users = self.ledger.get_manual_users(account_number)
-        line_items = self.ledger.get_custom_line_items(account_number)
+        # Independent Ledger reads, fetched concurrently on the shared pool
+        results = fan_out(
+            lambda: self.ledger.get_billing_for_client(account_number),
+            lambda: self.ledger.get_client_overrides(account_number),
+            lambda: self.ledger.get_billing_plans(),
+            lambda: self.ledger.get_manual_assets(account_number),
+            lambda: self.ledger.get_manual_users(account_number),
+            lambda: self.ledger.get_custom_line_items(account_number),
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+        billing_data, overrides, plans, manual_assets, manual_users, line_items = results
 
         return {
             'account_number': account_number,
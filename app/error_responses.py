@@ -2,8 +2,14 @@
 RFC 7807 Problem Details for HTTP APIs
 Provides standardized error response formatting across the application.
 """
-from flask import jsonify, request
+from flask import current_app, jsonify, request
 from werkzeug.http import HTTP_STATUS_CODES
+import orjson
+
+# Body of the {'error': 'Internal server error'} response returned by the API
+# routes' exception handlers. Serialized once, since these responses come in
+# bursts whenever an upstream service is failing.
+_INTERNAL_ERROR_BODY = orjson.dumps({'error': 'Internal server error'}) + b"\n"
 
 
 def problem_detail(status, title=None, detail=None, type_suffix=None, instance=None, **extra):
@@ -161,3 +167,9 @@ def service_unavailable(detail=None, retry_after=None, **extra):
     if retry_after:
         response.headers["Retry-After"] = str(retry_after)
     return response
+
+
+def internal_error_json():
+    """500 {'error': 'Internal server error'} from a pre-serialized body"""
+    return current_app.response_class(_INTERNAL_ERROR_BODY, status=500,
+                                      mimetype='application/json')
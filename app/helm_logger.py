@@ -64,8 +64,12 @@ class HelmLogger:
         self.batch_size = batch_size
         self.flush_interval = flush_interval
 
-        self.log_queue = queue.Queue()
+        # SimpleQueue.put is a single C-level append with no Condition to notify,
+        # so request threads never wait on the sender thread.
+        self.log_queue = queue.SimpleQueue()
         self.stop_event = threading.Event()
+        # Keep-alive connection to Core/Helm for the sender thread
+        self._session = requests.Session()
         self.token = None
         self.token_expires_at = 0  # Timestamp when token expires
 
@@ -88,7 +92,7 @@ class HelmLogger:
         # Token expired or doesn't exist, get a new one
         core_url = os.environ.get('CORE_SERVICE_URL', 'http://localhost:5000')
         try:
-            response = requests.post(
+            response = self._session.post(
                 f"{core_url}/service-token",
                 json={
                     "calling_service": self.service_name,
@@ -116,7 +120,7 @@ class HelmLogger:
             return
 
         try:
-            response = requests.post(
+            response = self._session.post(
                 f"{self.helm_url}/api/logs/ingest",
                 json={
                     "service_name": self.service_name,
@@ -146,6 +150,9 @@ class HelmLogger:
                 try:
                     log_entry = self.log_queue.get(timeout=1)
                     batch.append(log_entry)
+                    # Drain whatever else is already queued without blocking
+                    while len(batch) < self.batch_size:
+                        batch.append(self.log_queue.get_nowait())
                 except queue.Empty:
                     pass
 
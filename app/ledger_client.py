@@ -5,10 +5,24 @@ This module provides a client for interacting with the Ledger billing service.
 Used by Brainhair to manage billing overrides and settings.
 """
 
-from .service_client import call_service
+from app import app
+from .service_client import call_service, response_json, fan_out
 from .helm_logger import get_helm_logger
+from .response_cache import make_response_cache
 from typing import Dict, List, Any, Optional
-import json
+import orjson
+import secrets
+
+# Seconds to reuse results of Ledger reads that agents poll repeatedly. Any
+# successful write through this client invalidates them.
+READ_CACHE_TTL = 30
+PLANS_CACHE_TTL = 300
+
+# Cached reads are keyed under the cache generation that was current when they
+# started. A successful write starts a new generation instead of deleting
+# entries; old entries are never looked up again and expire on their own.
+CACHE_GENERATION_KEY = 'generation'
+CACHE_GENERATION_TTL = 86400
 
 
 class LedgerClient:
@@ -16,8 +30,28 @@ class LedgerClient:
 
     def __init__(self):
         self.logger = get_helm_logger()
-
-    def _call_ledger(self, endpoint: str, method: str = 'GET', data: Optional[Dict] = None) -> Dict:
+        # Shared with other workers through Redis when RESPONSE_CACHE_URL is set, so
+        # a write in one worker invalidates reads everywhere
+        self._cache = make_response_cache('ledger', app.config.get('RESPONSE_CACHE_URL'),
+                                          maxsize=1024, ttl=READ_CACHE_TTL)
+
+    def _cache_generation(self) -> str:
+        """Current read cache generation, starting a new one if none is stored."""
+        generation = self._cache.get(CACHE_GENERATION_KEY)
+        if generation is None:
+            generation = self._new_cache_generation()
+        return generation
+
+    def _new_cache_generation(self) -> str:
+        """Start a new read cache generation, invalidating every cached read."""
+        # Random rather than a counter, so concurrent writers in different
+        # workers can never both move to the same generation
+        generation = secrets.token_hex(8)
+        self._cache.set(CACHE_GENERATION_KEY, generation, ttl=CACHE_GENERATION_TTL)
+        return generation
+
+    def _call_ledger(self, endpoint: str, method: str = 'GET', data: Optional[Dict] = None,
+                     params: Optional[Dict] = None, cache_ttl: Optional[float] = None) -> Dict:
         """
         Internal method to call Ledger service.
 
@@ -25,13 +59,27 @@ class LedgerClient:
             endpoint: API endpoint (e.g., '/api/billing/123456')
             method: HTTP method
             data: Request payload for POST/PUT
+            params: Query parameters for GET requests
+            cache_ttl: If set, reuse a successful GET result for this many seconds.
+                       Results are cached as JSON bytes, so every call returns
+                       its own copy.
 
         Returns:
             Response data as dict
         """
+        cache_key = None
+        if method == 'GET' and cache_ttl:
+            # A read still in flight when a write succeeds is stored under the old
+            # generation, where no later lookup will find it
+            cache_key = (self._cache_generation(), endpoint,
+                         tuple(sorted(params.items())) if params else ())
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                return orjson.loads(cached)
+
         try:
             if method == 'GET':
-                response = call_service('ledger', endpoint)
+                response = call_service('ledger', endpoint, params=params)
             elif method in ['POST', 'PUT']:
                 response = call_service('ledger', endpoint, method=method, json=data)
             elif method == 'DELETE':
@@ -40,13 +88,20 @@ class LedgerClient:
                 raise ValueError(f"Unsupported method: {method}")
 
             if response.status_code >= 200 and response.status_code < 300:
-                return response.json()
+                result = response_json(response)
+                if cache_key is not None:
+                    self._cache.set(cache_key, response.content, ttl=cache_ttl)
+                elif method != 'GET':
+                    # Overrides, manual entries and line items feed into billing and
+                    # invoice totals, so any write invalidates every cached read
+                    self._new_cache_generation()
+                return result
             else:
                 self.logger.error(f"Ledger API error: {response.status_code} - {response.text}")
                 return {'error': f"Ledger returned {response.status_code}", 'details': response.text}
 
         except Exception as e:
-            self.logger.error(f"Error calling Ledger: {e}", exc_info=True)
+            self.logger.error(f"Error calling Ledger: {e}")
             return {'error': 'Internal server error'}
 
     # ===== BILLING DATA =====
@@ -64,16 +119,43 @@ class LedgerClient:
             Billing data including receipt, quantities, rates
         """
         endpoint = f'/api/billing/{account_number}'
-        params = []
+        params = {}
         if year:
-            params.append(f'year={year}')
+            params['year'] = year
         if month:
-            params.append(f'month={month}')
-        if params:
-            endpoint += '?' + '&'.join(params)
+            params['month'] = month
 
         self.logger.info(f"Fetching billing data for {account_number}")
-        return self._call_ledger(endpoint)
+        return self._call_ledger(endpoint, params=params, cache_ttl=READ_CACHE_TTL)
+
+    def get_billing_bulk(self, account_numbers: List[str], year: int = None,
+                         month: int = None) -> Dict[str, Dict]:
+        """
+        Get billing data for several clients at once.
+
+        Ledger has no multi-account billing endpoint, so the per-client reads are
+        issued concurrently (and served from the read cache where possible)
+        instead of one round-trip after another.
+
+        Args:
+            account_numbers: Company account numbers
+            year: Billing year (optional, defaults to current)
+            month: Billing month (optional, defaults to current)
+
+        Returns:
+            Dict mapping each account number to its billing data (or error dict)
+        """
+        self.logger.info(f"Fetching billing data for {len(account_numbers)} accounts")
+        results = fan_out(*[
+            lambda account_number=account_number: self.get_billing_for_client(
+                account_number, year, month)
+            for account_number in account_numbers
+        ])
+
+        return {
+            account_number: {'error': 'Internal server error'} if isinstance(result, Exception) else result
+            for account_number, result in zip(account_numbers, results)
+        }
 
     def get_billing_dashboard(self, year: int = None, month: int = None) -> Dict:
         """
@@ -87,16 +169,14 @@ class LedgerClient:
             Dashboard data with all companies
         """
         endpoint = '/api/billing/dashboard'
-        params = []
+        params = {}
         if year:
-            params.append(f'year={year}')
+            params['year'] = year
         if month:
-            params.append(f'month={month}')
-        if params:
-            endpoint += '?' + '&'.join(params)
+            params['month'] = month
 
         self.logger.info("Fetching billing dashboard")
-        return self._call_ledger(endpoint)
+        return self._call_ledger(endpoint, params=params, cache_ttl=READ_CACHE_TTL)
 
     def get_billing_plans(self) -> List[Dict]:
         """
@@ -106,7 +186,7 @@ class LedgerClient:
             List of billing plans with rates
         """
         self.logger.info("Fetching billing plans")
-        result = self._call_ledger('/api/plans')
+        result = self._call_ledger('/api/plans', cache_ttl=PLANS_CACHE_TTL)
         return result if isinstance(result, list) else []
 
     # ===== CLIENT OVERRIDES =====
@@ -122,7 +202,7 @@ class LedgerClient:
             Override data or None
         """
         self.logger.info(f"Fetching overrides for {account_number}")
-        return self._call_ledger(f'/api/overrides/client/{account_number}')
+        return self._call_ledger(f'/api/overrides/client/{account_number}', cache_ttl=READ_CACHE_TTL)
 
     def set_client_override(self, account_number: str, overrides: Dict) -> Dict:
         """
@@ -189,7 +269,8 @@ class LedgerClient:
 
     def get_manual_assets(self, account_number: str) -> List[Dict]:
         """Get all manual assets for a company."""
-        result = self._call_ledger(f'/api/overrides/manual-assets/{account_number}')
+        result = self._call_ledger(f'/api/overrides/manual-assets/{account_number}',
+                                   cache_ttl=READ_CACHE_TTL)
         return result.get('manual_assets', []) if isinstance(result, dict) else []
 
     def add_manual_asset(self, account_number: str, hostname: str, billing_type: str,
@@ -213,7 +294,8 @@ class LedgerClient:
 
     def get_manual_users(self, account_number: str) -> List[Dict]:
         """Get all manual users for a company."""
-        result = self._call_ledger(f'/api/overrides/manual-users/{account_number}')
+        result = self._call_ledger(f'/api/overrides/manual-users/{account_number}',
+                                   cache_ttl=READ_CACHE_TTL)
         return result.get('manual_users', []) if isinstance(result, dict) else []
 
     def add_manual_user(self, account_number: str, full_name: str, billing_type: str,
@@ -237,7 +319,8 @@ class LedgerClient:
 
     def get_custom_line_items(self, account_number: str) -> List[Dict]:
         """Get all custom line items for a company."""
-        result = self._call_ledger(f'/api/overrides/line-items/{account_number}')
+        result = self._call_ledger(f'/api/overrides/line-items/{account_number}',
+                                   cache_ttl=READ_CACHE_TTL)
         return result.get('line_items', []) if isinstance(result, dict) else []
 
     def add_custom_line_item(self, account_number: str, name: str, **kwargs) -> Dict:
@@ -266,11 +349,13 @@ class LedgerClient:
 
     def get_invoice_summary(self, account_number: str, year: int, month: int) -> Dict:
         """Get invoice summary for a specific period."""
-        return self._call_ledger(f'/api/invoice/{account_number}/summary?year={year}&month={month}')
+        return self._call_ledger(f'/api/invoice/{account_number}/summary',
+                                 params={'year': year, 'month': month}, cache_ttl=READ_CACHE_TTL)
 
     def check_bill_archived(self, account_number: str, year: int, month: int) -> Dict:
         """Check if a bill has been archived."""
-        return self._call_ledger(f'/api/bill/check-archived/{account_number}?year={year}&month={month}')
+        return self._call_ledger(f'/api/bill/check-archived/{account_number}',
+                                 params={'year': year, 'month': month})
 
     def accept_bill(self, account_number: str, year: int, month: int, notes: str = None) -> Dict:
         """Accept and archive a bill."""
@@ -6,11 +6,13 @@ in text data before exposing it through APIs. It handles PHI (Protected Health
 Information) and CJIS (Criminal Justice Information Systems) data.
 """
 
-from presidio_analyzer import AnalyzerEngine, RecognizerRegistry
+from presidio_analyzer import (AnalyzerEngine, BatchAnalyzerEngine, EntityRecognizer,
+                               PatternRecognizer)
 from presidio_anonymizer import AnonymizerEngine
 from presidio_anonymizer.entities import OperatorConfig
 from typing import Dict, List, Any, Optional
-import json
+from collections import deque
+import re
 import os
 import sys
 
@@ -18,6 +20,23 @@ import sys
 sys.path.insert(0, os.path.dirname(__file__))
 from custom_anonymizers import FirstNameLastInitialOperator
 
+# Characters at least one of which must appear in a string for Presidio's
+# pattern recognizers to match the entity. Entities detected by NER (PERSON,
+# LOCATION, NRP, ...) have no entry, so any entity list containing them is
+# always sent to the analyzer.
+ENTITY_TRIGGER_CHARS = {
+    "US_SSN": r"\d",
+    "CREDIT_CARD": r"\d",
+    "IBAN_CODE": r"\d",
+    "US_PASSPORT": r"\d",
+    "US_DRIVER_LICENSE": r"\d*",   # WA licenses may use '*' instead of digits
+    "US_BANK_NUMBER": r"\d",
+    "PHONE_NUMBER": r"\d",
+    "EMAIL_ADDRESS": "@",
+    "IP_ADDRESS": r"\d:",
+}
+
+
 class PresidioFilter:
     """
     Manages PHI/CJIS data filtering using Microsoft Presidio.
@@ -29,6 +48,7 @@ class PresidioFilter:
     def __init__(self):
         """Initialize Presidio analyzer and anonymizer engines."""
         self.analyzer = AnalyzerEngine()
+        self.batch_analyzer = BatchAnalyzerEngine(analyzer_engine=self.analyzer)
         self.anonymizer = AnonymizerEngine()
 
         # Register custom anonymizers
@@ -80,6 +100,119 @@ class PresidioFilter:
         # Default to critical_entities for MSP use (minimal redaction)
         self.default_entities = self.critical_entities
 
+        # Operator configs keyed by (entity tuple, anonymization type). Built once per
+        # combination instead of on every anonymize_text call.
+        self._operators: Dict[tuple, Dict[str, OperatorConfig]] = {}
+        # Prefilter regexes keyed by entity tuple (None when NER is required)
+        self._prefilters: Dict[tuple, Optional[re.Pattern]] = {}
+        # Regex-only recognizers keyed by entity tuple (None when NER is required)
+        self._pattern_recognizers: Dict[tuple, Optional[List[PatternRecognizer]]] = {}
+        for entities in (self.critical_entities, self.hipaa_entities, self.cjis_entities):
+            self._get_operators(entities, "replace")
+            self._get_prefilter(entities)
+            self._get_pattern_recognizers(entities)
+
+    def _get_operators(self, entity_types: List[str],
+                       anonymization_type: str) -> Dict[str, OperatorConfig]:
+        """
+        Get (and memoize) the anonymization operators for an entity list.
+
+        Args:
+            entity_types: List of entity types to anonymize
+            anonymization_type: Type of anonymization ("replace", "mask", "redact", "hash")
+
+        Returns:
+            Dict mapping entity type to OperatorConfig
+        """
+        key = (tuple(entity_types), anonymization_type)
+        operators = self._operators.get(key)
+        if operators is not None:
+            return operators
+
+        operators = {}
+        if anonymization_type == "replace":
+            # Use custom anonymizer for PERSON entities (FirstName L. format)
+            # Replace other entities with type labels
+            for entity in entity_types:
+                if entity == "PERSON":
+                    operators[entity] = OperatorConfig("first_name_last_initial", {})
+                else:
+                    operators[entity] = OperatorConfig("replace", {"new_value": f"<{entity}>"})
+        elif anonymization_type == "mask":
+            # Mask with asterisks
+            mask = {"masking_char": "*", "chars_to_mask": 100, "from_end": False}
+            operators = {entity: OperatorConfig("mask", mask)
+                         for entity in entity_types}
+        elif anonymization_type == "redact":
+            # Remove completely
+            operators = {entity: OperatorConfig("redact", {})
+                         for entity in entity_types}
+        elif anonymization_type == "hash":
+            # Hash the values
+            operators = {entity: OperatorConfig("hash", {})
+                         for entity in entity_types}
+
+        self._operators[key] = operators
+        return operators
+
+    def _get_prefilter(self, entity_types: List[str]) -> Optional[re.Pattern]:
+        """
+        Get (and memoize) a regex that any text containing the entities must match.
+
+        The regex is a single character class built from ENTITY_TRIGGER_CHARS,
+        so checking it is one scan of the string. Text that doesn't match can't
+        contain any of the entities and is returned without running the analyzer
+        (and its spaCy pipeline).
+
+        Args:
+            entity_types: List of entity types to detect
+
+        Returns:
+            Compiled regex, or None if an entity needs NER and can't be prefiltered
+        """
+        key = tuple(entity_types)
+        if key in self._prefilters:
+            return self._prefilters[key]
+
+        triggers = [ENTITY_TRIGGER_CHARS.get(entity) for entity in entity_types]
+        prefilter = None
+        if triggers and all(triggers):
+            prefilter = re.compile(f"[{''.join(sorted(set(triggers)))}]")
+
+        self._prefilters[key] = prefilter
+        return prefilter
+
+    def _get_pattern_recognizers(
+            self, entity_types: List[str]) -> Optional[List[PatternRecognizer]]:
+        """
+        Get (and memoize) the recognizers for an entity list if all are regex-based.
+
+        Pattern recognizers (including their checksum and invalidation rules)
+        only use the spaCy NLP artifacts to raise scores from nearby context
+        words. The analyzer keeps every result regardless of score, so running
+        them directly finds the same entities and spans without the spaCy
+        pipeline. Scores are not raised, though, and the anonymizer uses them
+        to pick one label where matches for different entities cover the same
+        text (e.g. a 9-digit number matching US_SSN and US_PASSPORT). That
+        text is still redacted, but its label may differ from the analyzer's.
+
+        Args:
+            entity_types: List of entity types to detect
+
+        Returns:
+            List of PatternRecognizer, or None if an entity needs NER
+        """
+        key = tuple(entity_types)
+        if key in self._pattern_recognizers:
+            return self._pattern_recognizers[key]
+
+        recognizers = self.analyzer.registry.get_recognizers(language='en', entities=entity_types)
+        if not all(isinstance(recognizer, PatternRecognizer) for recognizer in recognizers):
+            recognizers = None
+
+        self._pattern_recognizers[key] = recognizers
+        return recognizers
+
     def analyze_text(self, text: str, entity_types: Optional[List[str]] = None) -> List:
         """
         Analyze text to find sensitive entities.
@@ -94,6 +227,17 @@ class PresidioFilter:
         if entity_types is None:
             entity_types = self.default_entities
 
+        # Regex-only entity lists (e.g. 'standard') skip the spaCy pipeline
+        recognizers = self._get_pattern_recognizers(entity_types)
+        if recognizers is not None:
+            results = [
+                result
+                for recognizer in recognizers
+                for result in recognizer.analyze(text, entity_types, None)
+                if result.entity_type in entity_types
+            ]
+            return EntityRecognizer.remove_duplicates(results)
+
         results = self.analyzer.analyze(
             text=text,
             language='en',
@@ -103,7 +247,8 @@ class PresidioFilter:
         return results
 
     def anonymize_text(self, text: str, entity_types: Optional[List[str]] = None,
-                      anonymization_type: str = "replace") -> str:
+                       anonymization_type: str = "replace",
+                       cache: Optional[Dict[str, str]] = None) -> str:
         """
         Anonymize sensitive information in text.
 
@@ -111,39 +256,31 @@ class PresidioFilter:
             text: The text to anonymize
             entity_types: List of entity types to anonymize (defaults to critical entities)
             anonymization_type: Type of anonymization ("replace", "mask", "redact", "hash")
+            cache: Optional per-request dict of already anonymized strings. Values that
+                   repeat across a payload (company names, assignee emails) are only
+                   run through Presidio once.
 
         Returns:
             Anonymized text with sensitive information replaced
         """
+        if cache is not None:
+            cached = cache.get(text)
+            if cached is not None:
+                return cached
+
         if entity_types is None:
             entity_types = self.default_entities
 
+        # Skip the analyzer for text that can't contain any of the entities
+        prefilter = self._get_prefilter(entity_types)
+        if prefilter is not None and not prefilter.search(text):
+            return text
+
         # Analyze the text first
         results = self.analyze_text(text, entity_types)
 
-        # Define anonymization operators
-        operators = {}
-        if anonymization_type == "replace":
-            # Use custom anonymizer for PERSON entities (FirstName L. format)
-            # Replace other entities with type labels
-            operators = {}
-            for entity in entity_types:
-                if entity == "PERSON":
-                    operators[entity] = OperatorConfig("first_name_last_initial", {})
-                else:
-                    operators[entity] = OperatorConfig("replace", {"new_value": f"<{entity}>"})
-        elif anonymization_type == "mask":
-            # Mask with asterisks
-            operators = {entity: OperatorConfig("mask", {"masking_char": "*", "chars_to_mask": 100, "from_end": False})
-                        for entity in entity_types}
-        elif anonymization_type == "redact":
-            # Remove completely
-            operators = {entity: OperatorConfig("redact", {})
-                        for entity in entity_types}
-        elif anonymization_type == "hash":
-            # Hash the values
-            operators = {entity: OperatorConfig("hash", {})
-                        for entity in entity_types}
+        # Anonymization operators are precomputed per entity list/type
+        operators = self._get_operators(entity_types, anonymization_type)
 
         # Anonymize the text
         anonymized_result = self.anonymizer.anonymize(
@@ -152,11 +289,48 @@ class PresidioFilter:
             operators=operators
         )
 
+        if cache is not None:
+            cache[text] = anonymized_result.text
+
         return anonymized_result.text
 
+    def _anonymize_batch(self, texts: List[str], entity_types: List[str],
+                         anonymization_type: str) -> List[str]:
+        """
+        Anonymize several texts, running the NLP pipeline over them as one batch.
+
+        Presidio's per-call cost is dominated by the spaCy pipeline; batching
+        lets spaCy process the texts together (nlp.pipe) instead of one by one.
+
+        Args:
+            texts: Texts to anonymize
+            entity_types: List of entity types to anonymize
+            anonymization_type: Type of anonymization
+
+        Returns:
+            Anonymized texts, in the same order
+        """
+        operators = self._get_operators(entity_types, anonymization_type)
+        if self._get_pattern_recognizers(entity_types) is not None:
+            # No NLP pipeline to batch; the regexes run per text
+            results = [self.analyze_text(text, entity_types) for text in texts]
+        else:
+            results = self.batch_analyzer.analyze_iterator(
+                texts,
+                language='en',
+                entities=entity_types
+            )
+
+        return [
+            self.anonymizer.anonymize(text=text, analyzer_results=analyzer_results,
+                                      operators=operators).text
+            for text, analyzer_results in zip(texts, results)
+        ]
+
     def filter_dict(self, data: Dict[str, Any], fields_to_filter: Optional[List[str]] = None,
-                   entity_types: Optional[List[str]] = None,
-                   anonymization_type: str = "replace") -> Dict[str, Any]:
+                    entity_types: Optional[List[str]] = None,
+                    anonymization_type: str = "replace",
+                    cache: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
         """
         Filter sensitive information from a dictionary.
 
@@ -165,6 +339,7 @@ class PresidioFilter:
             fields_to_filter: List of field names to filter (if None, filters all string fields)
             entity_types: List of entity types to detect (defaults to critical entities)
             anonymization_type: Type of anonymization
+            cache: Optional per-request anonymization cache (see anonymize_text)
 
         Returns:
             Filtered dictionary with sensitive information anonymized
@@ -172,32 +347,12 @@ class PresidioFilter:
         if entity_types is None:
             entity_types = self.default_entities
 
-        filtered_data = data.copy()
-
-        for key, value in filtered_data.items():
-            # Skip if we have a specific field list and this field isn't in it
-            if fields_to_filter and key not in fields_to_filter:
-                continue
-
-            if isinstance(value, str):
-                filtered_data[key] = self.anonymize_text(value, entity_types, anonymization_type)
-            elif isinstance(value, dict):
-                filtered_data[key] = self.filter_dict(value, fields_to_filter, entity_types, anonymization_type)
-            elif isinstance(value, list):
-                filtered_data[key] = [
-                    self.filter_dict(item, fields_to_filter, entity_types, anonymization_type)
-                    if isinstance(item, dict)
-                    else self.anonymize_text(item, entity_types, anonymization_type)
-                    if isinstance(item, str)
-                    else item
-                    for item in value
-                ]
-
-        return filtered_data
+        return self._walk(data, fields_to_filter, entity_types, anonymization_type, cache)
 
     def filter_list(self, data: List[Any], fields_to_filter: Optional[List[str]] = None,
-                   entity_types: Optional[List[str]] = None,
-                   anonymization_type: str = "replace") -> List[Any]:
+                    entity_types: Optional[List[str]] = None,
+                    anonymization_type: str = "replace",
+                    cache: Optional[Dict[str, str]] = None) -> List[Any]:
         """
         Filter sensitive information from a list.
 
@@ -206,6 +361,7 @@ class PresidioFilter:
             fields_to_filter: List of field names to filter in dict items
             entity_types: List of entity types to detect (defaults to critical entities)
             anonymization_type: Type of anonymization
+            cache: Optional per-request anonymization cache (see anonymize_text)
 
         Returns:
             Filtered list with sensitive information anonymized
@@ -213,16 +369,72 @@ class PresidioFilter:
         if entity_types is None:
             entity_types = self.default_entities
 
-        filtered_list = []
-        for item in data:
-            if isinstance(item, dict):
-                filtered_list.append(self.filter_dict(item, fields_to_filter, entity_types, anonymization_type))
-            elif isinstance(item, str):
-                filtered_list.append(self.anonymize_text(item, entity_types, anonymization_type))
-            else:
-                filtered_list.append(item)
+        return self._walk(data, fields_to_filter, entity_types, anonymization_type, cache)
+
+    def _walk(self, root: Any, fields_to_filter: Optional[List[str]],
+              entity_types: List[str], anonymization_type: str,
+              cache: Optional[Dict[str, str]]) -> Any:
+        """
+        Filter a nested dict/list structure using an explicit stack.
+
+        Containers are shallow-copied as they are visited so the input is never
+        mutated. Iterating instead of recursing avoids per-node frame overhead
+        and cannot hit the recursion limit on deeply nested Codex payloads.
+        Strings that need analysis are collected during the walk and sent
+        through Presidio as one batch (see _anonymize_batch).
 
-        return filtered_list
+        Args:
+            root: Dict, list, or string to filter
+            fields_to_filter: Dict keys to descend into (None means all keys)
+            entity_types: List of entity types to detect
+            anonymization_type: Type of anonymization
+            cache: Optional per-request anonymization cache (see anonymize_text)
+
+        Returns:
+            Filtered copy of root
+        """
+        if isinstance(root, str):
+            return self.anonymize_text(root, entity_types, anonymization_type, cache)
+        if not isinstance(root, (dict, list)):
+            return root
+
+        prefilter = self._get_prefilter(entity_types)
+        # Strings to analyze, each mapped to the (container, key) slots holding it
+        pending: Dict[str, List[tuple]] = {}
+
+        result = [root]
+        stack = deque([(root, result, 0)])
+
+        # Scalars (ids, counts, flags, None) and tuples are left in the copied
+        # container without being pushed at all.
+        while stack:
+            node, parent, key = stack.pop()
+
+            node = parent[key] = node.copy()
+            is_dict = isinstance(node, dict)
+            for k, v in (node.items() if is_dict else enumerate(node)):
+                # Skip if we have a specific field list and this field isn't in it
+                if is_dict and fields_to_filter and k not in fields_to_filter:
+                    continue
+                if isinstance(v, str):
+                    cached = cache.get(v) if cache is not None else None
+                    if cached is not None:
+                        node[k] = cached
+                    elif prefilter is None or prefilter.search(v):
+                        pending.setdefault(v, []).append((node, k))
+                elif isinstance(v, (dict, list)):
+                    stack.append((v, node, k))
+
+        if pending:
+            texts = list(pending)
+            anonymized = self._anonymize_batch(texts, entity_types, anonymization_type)
+            for text, new_text in zip(texts, anonymized):
+                if cache is not None:
+                    cache[text] = new_text
+                for node, k in pending[text]:
+                    node[k] = new_text
+
+        return result[0]
 
     def filter_phi(self, data: Any, fields_to_filter: Optional[List[str]] = None) -> Any:
         """
@@ -238,14 +450,8 @@ class PresidioFilter:
         Returns:
             Filtered data with critical entities anonymized
         """
-        if isinstance(data, dict):
-            return self.filter_dict(data, fields_to_filter, self.default_entities)
-        elif isinstance(data, list):
-            return self.filter_list(data, fields_to_filter, self.default_entities)
-        elif isinstance(data, str):
-            return self.anonymize_text(data, self.default_entities)
-        else:
-            return data
+        # _walk handles dicts, lists, strings and passes other values through
+        return self._walk(data, fields_to_filter, self.default_entities, "replace", None)
 
     def filter_cjis(self, data: Any, fields_to_filter: Optional[List[str]] = None) -> Any:
         """
@@ -258,14 +464,7 @@ class PresidioFilter:
         Returns:
             Filtered data with CJIS information anonymized
         """
-        if isinstance(data, dict):
-            return self.filter_dict(data, fields_to_filter, self.cjis_entities)
-        elif isinstance(data, list):
-            return self.filter_list(data, fields_to_filter, self.cjis_entities)
-        elif isinstance(data, str):
-            return self.anonymize_text(data, self.cjis_entities)
-        else:
-            return data
+        return self._walk(data, fields_to_filter, self.cjis_entities, "replace", None)
 
 
 # Global instance for easy import
@@ -301,7 +500,8 @@ def filter_data(data: Any, fields_to_filter: Optional[List[str]] = None) -> Any:
 
 
 def filter_by_compliance_level(data: Any, compliance_level: str = 'standard',
-                                fields_to_filter: Optional[List[str]] = None) -> Any:
+                               fields_to_filter: Optional[List[str]] = None,
+                               cache: Optional[Dict[str, str]] = None) -> Any:
     """
     Filter data based on company compliance level.
 
@@ -309,6 +509,8 @@ def filter_by_compliance_level(data: Any, compliance_level: str = 'standard',
         data: Data to filter (dict, list, or str)
         compliance_level: Compliance level ('standard', 'cjis', 'hipaa')
         fields_to_filter: List of field names to filter (for dict/list of dicts)
+        cache: Optional per-request anonymization cache. Must only be shared between
+               calls that use the same compliance level.
 
     Returns:
         Filtered data with appropriate entities anonymized based on compliance level
@@ -329,11 +531,4 @@ def filter_by_compliance_level(data: Any, compliance_level: str = 'standard',
         entity_list = filter_instance.critical_entities
 
     # Apply filtering with the appropriate entity list
-    if isinstance(data, dict):
-        return filter_instance.filter_dict(data, fields_to_filter, entity_list)
-    elif isinstance(data, list):
-        return filter_instance.filter_list(data, fields_to_filter, entity_list)
-    elif isinstance(data, str):
-        return filter_instance.anonymize_text(data, entity_list)
-    else:
-        return data
+    return filter_instance._walk(data, fields_to_filter, entity_list, "replace", cache)
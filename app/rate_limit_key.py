@@ -14,7 +14,11 @@ def get_user_id_or_ip():
 
     Priority:
     1. User ID from JWT token (g.user['sub'])
-    2. IP address (for unauthenticated requests)
+    2. Calling service from a service token (g.service)
+    3. IP address (for unauthenticated requests)
+
+    User and service identities are only set once token_required has run, so
+    route limits keyed on them must be applied below @token_required.
 
     This ensures:
     - Authenticated users are limited per-user (prevents abuse from shared IPs)
@@ -32,5 +36,9 @@ def get_user_id_or_ip():
         if user_id:
             return f"user:{user_id}"
 
+    # Service-to-service calls are limited per calling service
+    if getattr(g, 'is_service_call', False) and getattr(g, 'service', None):
+        return f"service:{g.service}"
+
     # Fall back to IP address for unauthenticated requests
     return f"ip:{get_remote_address()}"
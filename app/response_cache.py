@@ -0,0 +1,194 @@
+"""
+TTL caches for upstream responses.
+
+Used by the API routes to avoid re-fetching (and re-filtering) upstream data
+that many callers request within a few seconds of each other. Caches are
+in-process by default; set RESPONSE_CACHE_URL to a redis:// URL to share them
+between gunicorn workers and replicas.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+import orjson
+
+from .helm_logger import get_helm_logger
+
+
+class TTLCache:
+    """
+    Thread-safe cache with per-entry expiry and least-recently-used eviction.
+
+    Entries expire after `ttl` seconds (overridable per entry). When the cache
+    is full, the least recently used entry is evicted.
+    """
+
+    def __init__(self, maxsize: int = 4096, ttl: float = 30):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries to keep
+            ttl: Default time-to-live in seconds
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default if missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Store value under key for ttl seconds (defaults to the cache TTL)."""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove key from the cache and return its value (expired or not)."""
+        with self._lock:
+            entry = self._data.pop(key, None)
+            return default if entry is None else entry[0]
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+
+class RedisCache:
+    """
+    TTL cache stored in Redis so all workers share hits.
+
+    Same interface as TTLCache. Keys are hashed into '<prefix>:<digest>'.
+    bytes values are stored as-is; anything else is stored as JSON, so only
+    bytes and JSON-serializable values can be cached.
+    Redis errors are logged and treated as cache misses so an unavailable
+    Redis never fails a request.
+    """
+
+    def __init__(self, url: str, prefix: str, ttl: float = 30):
+        """
+        Initialize the cache.
+
+        Args:
+            url: Redis URL (e.g., 'redis://localhost:6379/2')
+            prefix: Key namespace for this cache (e.g., 'brainhair:v1:proxy')
+            ttl: Default time-to-live in seconds
+
+        Raises:
+            ImportError: If the redis package is not installed
+        """
+        import redis
+
+        self.ttl = ttl
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url)
+        self._errors = redis.RedisError
+
+    def _key(self, key: Hashable) -> str:
+        digest = hashlib.blake2b(repr(key).encode('utf-8'), digest_size=16).hexdigest()
+        return f"{self.prefix}:{digest}"
+
+    @staticmethod
+    def _encode(value: Any) -> bytes:
+        # One-byte tag so bytes values round-trip without a JSON wrapper
+        if isinstance(value, bytes):
+            return b"b" + value
+        return b"j" + orjson.dumps(value)
+
+    @staticmethod
+    def _decode(raw: bytes) -> Any:
+        if raw[:1] == b"b":
+            return raw[1:]
+        return orjson.loads(raw[1:])
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default if missing or expired."""
+        try:
+            raw = self._client.get(self._key(key))
+        except self._errors as e:
+            get_helm_logger().warning(f"Response cache read failed: {e}")
+            return default
+        return default if raw is None else self._decode(raw)
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Store value under key for ttl seconds (defaults to the cache TTL)."""
+        ttl_ms = int((self.ttl if ttl is None else ttl) * 1000)
+        try:
+            self._client.set(self._key(key), self._encode(value), px=max(ttl_ms, 1))
+        except self._errors as e:
+            get_helm_logger().warning(f"Response cache write failed: {e}")
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove key from the cache and return its value."""
+        try:
+            raw = self._client.getdel(self._key(key))
+        except self._errors as e:
+            get_helm_logger().warning(f"Response cache delete failed: {e}")
+            return default
+        return default if raw is None else self._decode(raw)
+
+    def clear(self):
+        """Remove all entries under this cache's prefix."""
+        try:
+            keys = list(self._client.scan_iter(match=f"{self.prefix}:*", count=1000))
+            if keys:
+                self._client.delete(*keys)
+        except self._errors as e:
+            get_helm_logger().warning(f"Response cache clear failed: {e}")
+
+    def __len__(self) -> int:
+        try:
+            return sum(1 for _ in self._client.scan_iter(match=f"{self.prefix}:*", count=1000))
+        except self._errors:
+            return 0
+
+
+def make_response_cache(name: str, url: Optional[str] = None,
+                        maxsize: int = 4096, ttl: float = 30):
+    """
+    Create a response cache, shared through Redis when a URL is configured.
+
+    Args:
+        name: Cache name, used as the Redis key namespace
+        url: Redis URL (RESPONSE_CACHE_URL), or None for an in-process cache
+        maxsize: Maximum entries for the in-process cache
+        ttl: Default time-to-live in seconds
+
+    Returns:
+        RedisCache or TTLCache
+    """
+    if url:
+        try:
+            return RedisCache(url, prefix=f"brainhair:v1:{name}", ttl=ttl)
+        except ImportError:
+            get_helm_logger().warning(
+                "RESPONSE_CACHE_URL is set but the redis package is not installed. "
+                f"Using an in-process cache for '{name}'."
+            )
+
+    return TTLCache(maxsize=maxsize, ttl=ttl)
@@ -7,23 +7,50 @@ PHI/CJIS filtering via Presidio.
 """
 
 from flask import render_template, g, jsonify, request, current_app
-from urllib.parse import quote
 from app import app, limiter
 from .auth import token_required, allow_localhost
-from .service_client import call_service
+from .error_responses import internal_error_json
+from .service_client import call_service, response_json, get_call_stats
 import sys
 import os
 
-# Health check library
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Health check library (shared HiveMatrix module at the repository root)
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
 from health_check import HealthChecker
 from .helm_logger import get_helm_logger
 from .presidio_filter import get_presidio_filter, filter_by_compliance_level
-from typing import Optional, Dict, Any
-import json
+from .response_cache import make_response_cache, TTLCache
+from .ledger_client import get_ledger_client
+from .contract_alignment import get_contract_alignment_tool
+from typing import Optional, Dict, Any, List
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturesTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+import hashlib
+import threading
+import time
+import orjson
 
+# Helm logger is initialized in app/__init__.py before routes are imported
+logger = get_helm_logger()
 
-def apply_company_filtering(data: Any) -> Any:
+# Filtered payloads, stored as JSON bytes and keyed by a hash of the upstream
+# JSON. Identical bodies (list and dashboard endpoints polled by several
+# clients) skip Presidio entirely.
+_filter_cache = make_response_cache('filter', app.config.get('RESPONSE_CACHE_URL'),
+                                    maxsize=512, ttl=3600)
+
+# Worker processes for Presidio filtering (see PRESIDIO_WORKERS). Created lazily
+# so each gunicorn worker gets its own pool after forking.
+_presidio_pool: Optional[ProcessPoolExecutor] = None
+_presidio_pool_lock = threading.Lock()
+
+# Seconds to wait for a Presidio worker before filtering in-process instead
+PRESIDIO_POOL_TIMEOUT = 30
+
+
+def apply_company_filtering(data: Any, raw: Optional[bytes] = None) -> Any:
     """
     Apply Presidio filtering to data based on company compliance levels.
 
@@ -35,6 +62,8 @@ def apply_company_filtering(data: Any) -> Any:
 
     Args:
         data: Data from Codex API (dict with compliance_level, or list of dicts)
+        raw: The upstream JSON bytes data was decoded from, if available. Used
+             as the cache key and worker payload instead of re-serializing data.
 
     Returns:
         Filtered data with appropriate entities anonymized per company
@@ -50,24 +79,118 @@ def apply_company_filtering(data: Any) -> Any:
             {'id': 2, 'company_compliance_level': 'standard', ...}
         ]
         filtered = apply_company_filtering(tickets)  # Per-ticket filtering
+
+    Results are cached by content hash as serialized JSON, so every call
+    returns a fresh object the caller is free to modify.
     """
+    if not isinstance(data, (dict, list)):
+        # Primitive type or unknown - return as-is
+        return data
+
+    payload = raw
+    if payload is None:
+        payload = orjson.dumps(data, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+                               default=str)
+    cache_key = hashlib.blake2b(payload, digest_size=16).digest()
+
+    filtered = _filter_cache.get(cache_key)
+    if filtered is None:
+        pool = _get_presidio_pool()
+        if pool is not None:
+            filtered = _filter_in_pool(pool, payload)
+        if filtered is None:
+            filtered = orjson.dumps(_filter_by_company(data),
+                                    option=orjson.OPT_NON_STR_KEYS, default=str)
+        _filter_cache.set(cache_key, filtered)
+
+    return orjson.loads(filtered)
+
+
+def _get_presidio_pool() -> Optional[ProcessPoolExecutor]:
+    """Return the Presidio worker pool, or None if PRESIDIO_WORKERS is 0."""
+    global _presidio_pool
+
+    workers = app.config.get('PRESIDIO_WORKERS', 0)
+    if workers <= 0:
+        return None
+
+    with _presidio_pool_lock:
+        if _presidio_pool is None:
+            # get_presidio_filter() as initializer loads the models once per worker
+            _presidio_pool = ProcessPoolExecutor(max_workers=workers,
+                                                 initializer=get_presidio_filter)
+    return _presidio_pool
+
+
+def _filter_in_pool(pool: ProcessPoolExecutor, payload: bytes) -> Optional[bytes]:
+    """
+    Filter a JSON payload on the Presidio worker pool.
+
+    Args:
+        pool: The pool returned by _get_presidio_pool()
+        payload: Serialized payload (shipped as bytes so large dicts aren't pickled)
+
+    Returns:
+        Filtered JSON, or None if the pool failed or timed out and the caller
+        should filter in-process instead
+    """
+    global _presidio_pool
+
+    future = None
+    try:
+        future = pool.submit(_filter_payload_worker, payload)
+        return future.result(timeout=PRESIDIO_POOL_TIMEOUT)
+    except BrokenProcessPool as e:
+        # A worker died (e.g. OOM while loading spaCy). The pool can't be used
+        # again, so drop it and let the next request start a fresh one.
+        logger.error(f"Presidio worker pool failed, restarting it: {e}")
+        with _presidio_pool_lock:
+            if _presidio_pool is pool:
+                _presidio_pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+    except FuturesTimeoutError:
+        future.cancel()
+        logger.warning(f"Presidio worker took over {PRESIDIO_POOL_TIMEOUT}s, filtering in-process")
+    return None
+
+
+def _filter_payload_worker(payload: bytes) -> bytes:
+    """Pool worker: filter a JSON payload and return the filtered JSON."""
+    return orjson.dumps(_filter_by_company(orjson.loads(payload)))
+
+
+def _filter_by_company(data: Any) -> Any:
+    """Run Presidio over data using each item's compliance level."""
+    # Per-request anonymization cache, one dict per compliance level. Strings that
+    # repeat across items (company names, assignee emails) hit Presidio only once.
+    request_cache: Dict[str, Dict[str, str]] = {}
+
     if isinstance(data, dict):
         # Single item - check for compliance_level fields
         compliance_level = data.get('compliance_level') or \
                           data.get('company_compliance_level', 'standard')
-        return filter_by_compliance_level(data, compliance_level)
+        return filter_by_compliance_level(data, compliance_level,
+                                          cache=request_cache.setdefault(compliance_level, {}))
 
     elif isinstance(data, list):
-        # List of items - apply per-item filtering
-        filtered_list = []
-        for item in data:
+        # List of items - group dict items by compliance level so each level's
+        # strings go through Presidio as one batch, then put them back in place.
+        # Anything else in the list is returned as-is.
+        filtered_list = list(data)
+        levels: Dict[str, List[int]] = {}
+        for i, item in enumerate(data):
             if isinstance(item, dict):
                 compliance_level = item.get('compliance_level') or \
                                   item.get('company_compliance_level', 'standard')
-                filtered_item = filter_by_compliance_level(item, compliance_level)
-                filtered_list.append(filtered_item)
-            else:
-                filtered_list.append(item)
+                levels.setdefault(compliance_level, []).append(i)
+
+        for compliance_level, indices in levels.items():
+            filtered_items = filter_by_compliance_level(
+                [data[i] for i in indices], compliance_level,
+                cache=request_cache.setdefault(compliance_level, {})
+            )
+            for i, filtered_item in zip(indices, filtered_items):
+                filtered_list[i] = filtered_item
         return filtered_list
 
     else:
@@ -75,6 +198,184 @@ def apply_company_filtering(data: Any) -> Any:
         return data
 
 
+# Serialized (filtered) response bodies for slow-changing read endpoints, keyed
+# by (service, endpoint, params). Filtering depends only on the payload's own
+# compliance_level fields, so entries can be shared across callers.
+_proxy_cache = make_response_cache('proxy', app.config.get('RESPONSE_CACHE_URL'),
+                                   maxsize=4096, ttl=30)
+
+# Per-user limit for endpoints that run large upstream queries and Presidio over
+# the results. Applied below @token_required so the key is the user/service.
+EXPENSIVE_ENDPOINT_LIMIT = "60 per minute;5 per second"
+
+# Maximum companies per /api/ledger/billing/bulk request
+MAX_BULK_ACCOUNTS = 100
+
+# Display names used in upstream error logs
+SERVICE_LABELS = {
+    'knowledgetree': 'KnowledgeTree',
+    'codex': 'Codex',
+    'beacon': 'Beacon',
+    'archive': 'Archive',
+}
+
+
+def _result_count(data: Any) -> Optional[int]:
+    """Number of items in an upstream payload (list, or dict with a 'results' list)."""
+    if isinstance(data, list):
+        return len(data)
+    if isinstance(data, dict) and isinstance(data.get('results'), list):
+        return len(data['results'])
+    return None
+
+
+def _limit_arg(default: int = 50) -> int:
+    """The 'limit' query parameter as a positive int (default if missing or invalid)."""
+    limit = request.args.get('limit', default, type=int)
+    return limit if limit > 0 else default
+
+
+def _result_limit_cost() -> int:
+    """Rate-limit cost of a request: one hit per 50 results requested via 'limit'."""
+    return -(-_limit_arg() // 50)
+
+
+def _json_body(*required: str, error: str = 'No data provided'):
+    """
+    Parse the JSON request body and check its required fields in one pass.
+
+    Args:
+        *required: Keys that must be present in the body
+        error: Client-facing message when the body is missing, not a JSON
+            object, or lacks a required key
+
+    Returns:
+        (data, None) on success, or (None, 400 response) on failure
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or not data or any(field not in data for field in required):
+        return None, (jsonify({'error': error}), 400)
+    return data, None
+
+
+def conditional_json(data):
+    """
+    JSON response with an ETag, answered with 304 when the client's copy matches.
+
+    Agents re-read the same settings, manual entries and invoice summaries
+    repeatedly; an If-None-Match hit skips sending the body again.
+    """
+    return _make_conditional(jsonify(data))
+
+
+def _make_conditional(response):
+    """Tag response with an ETag of its body and answer If-None-Match with 304."""
+    response.set_etag(hashlib.blake2b(response.get_data(), digest_size=16).hexdigest())
+    return response.make_conditional(request)
+
+
+def proxy_service_get(service: str, endpoint: str, label: str, error_message: str,
+                      params: Optional[Dict[str, Any]] = None,
+                      extra: Optional[Dict[str, Any]] = None,
+                      log_detail: Optional[str] = None,
+                      cache_ttl: Optional[float] = None):
+    """
+    Proxy a GET request to another HiveMatrix service with compliance filtering.
+
+    Shared body of the read-only proxy endpoints: call the upstream service,
+    apply per-company Presidio filtering, log, and wrap the result. Responses
+    carry an ETag, so clients that send If-None-Match get a 304 when the
+    filtered result is unchanged.
+
+    Args:
+        service: Target service name (e.g., 'codex')
+        endpoint: Upstream path (e.g., '/api/companies')
+        label: Log label (e.g., 'Codex companies retrieval')
+        error_message: Client-facing error for non-200 upstream responses
+        params: Query parameters for the upstream request
+        extra: Additional keys to include alongside 'data' in the response
+        log_detail: Extra detail for the success log line
+        cache_ttl: If set, cache the filtered response for this many seconds
+
+    Returns:
+        Flask response tuple
+    """
+    cache_key = None
+    if cache_ttl:
+        cache_key = (service, endpoint, tuple(sorted(params.items())) if params else ())
+        # Cached as the serialized response body, so a hit skips encoding entirely
+        body = _proxy_cache.get(cache_key)
+        if body is not None:
+            response = app.response_class(body, mimetype='application/json')
+            response.headers['Cache-Control'] = f'private, max-age={int(cache_ttl)}'
+            return _make_conditional(response)
+
+    try:
+        response = call_service(service, endpoint, params=params)
+
+        if response.status_code == 200:
+            data = response_json(response)
+
+            # Apply Presidio filtering
+            filtered_data = apply_company_filtering(data, raw=response.content)
+
+            details = [log_detail] if log_detail else []
+            count = _result_count(data)
+            if count is not None:
+                details.append(f"count={count}")
+            message = f"{label} completed"
+            if details:
+                message += f": {', '.join(details)}"
+            logger.info(message)
+
+            body = dict(extra) if extra else {}
+            body['data'] = filtered_data
+
+            response = jsonify(body)
+            if cache_key is not None:
+                _proxy_cache.set(cache_key, response.get_data(), ttl=cache_ttl)
+                response.headers['Cache-Control'] = f'private, max-age={int(cache_ttl)}'
+
+            return _make_conditional(response)
+        else:
+            logger.error(f"{label} failed: {response.status_code}")
+            return jsonify({'error': error_message}), response.status_code
+
+    except Exception as e:
+        logger.error(f"Error calling {SERVICE_LABELS.get(service, service)}: {e}")
+        return internal_error_json()
+
+
+# Rendered user pages keyed by (template, script_root). The templates don't use
+# the user object (it's loaded client-side); output only depends on the URL
+# prefix set by the Nexus proxy, which url_for bakes into the page.
+_page_cache = TTLCache(maxsize=32, ttl=3600)
+
+
+def render_user_page(template: str) -> str:
+    """
+    Render a user-facing page template, reusing the rendered HTML.
+
+    Rendering is skipped on repeat visits outside debug mode, where templates
+    are auto-reloaded and must be re-rendered to pick up edits.
+
+    Args:
+        template: Template name (e.g., 'index.html')
+
+    Returns:
+        Rendered HTML
+    """
+    if app.debug:
+        return render_template(template)
+
+    key = (template, request.script_root)
+    page = _page_cache.get(key)
+    if page is None:
+        page = render_template(template)
+        _page_cache.set(key, page)
+    return page
+
+
 @app.route('/')
 @token_required
 def index():
@@ -82,8 +383,6 @@ def index():
     Renders the main page of Brain Hair.
     Shows available API endpoints for Claude to use.
     """
-    logger = get_helm_logger()
-
     # Check if this is a service call or user call
     if g.is_service_call:
         logger.warning(f"Service {g.service} attempted to access user-only endpoint /")
@@ -96,7 +395,7 @@ def index():
     logger.info(f"User {user.get('preferred_username')} accessed Brain Hair index page")
 
     # Render a page showing available endpoints
-    return render_template('index.html', user=user)
+    return render_user_page('index.html')
 
 
 @app.route('/history')
@@ -105,8 +404,6 @@ def history_page():
     """
     Renders the chat history page.
     """
-    logger = get_helm_logger()
-
     if g.is_service_call:
         logger.warning(f"Service {g.service} attempted to access user-only endpoint /history")
         return jsonify({
@@ -117,7 +414,7 @@ def history_page():
     user = g.user
     logger.info(f"User {user.get('preferred_username')} accessed chat history page")
 
-    return render_template('history.html', user=user)
+    return render_user_page('history.html')
 
 
 # ==================== KnowledgeTree Integration ====================
@@ -131,43 +428,16 @@ def knowledge_search():
     Compliance-based filtering is applied automatically per company.
         q: Search query
     """
-    logger = get_helm_logger()
-
     query = request.args.get('q', '')
 
     if not query:
         return jsonify({'error': 'Query parameter "q" is required'}), 400
 
-    try:
-        # Call KnowledgeTree service (URL-encode query to prevent injection)
-        response = call_service('knowledgetree', f'/api/search?q={quote(query, safe="")}')
-
-        if response.status_code == 200:
-            data = response.json()
-
-            # Apply Presidio filtering
-            filtered_data = apply_company_filtering(data)
-
-            # Handle both dict and list responses
-            if isinstance(data, dict):
-                result_count = len(data.get('results', []))
-            elif isinstance(data, list):
-                result_count = len(data)
-            else:
-                result_count = 'unknown'
-            logger.info(f"Knowledge search completed: query='{query}', results={result_count}")
-
-            return jsonify({
-                'query': query,
-                'data': filtered_data
-            })
-        else:
-            logger.error(f"KnowledgeTree search failed: {response.status_code}")
-            return jsonify({'error': 'KnowledgeTree search failed'}), response.status_code
-
-    except Exception as e:
-        logger.error(f"Error calling KnowledgeTree: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+    return proxy_service_get(
+        'knowledgetree', '/api/search',
+        'KnowledgeTree search', 'KnowledgeTree search failed',
+        params={'q': query}, extra={'query': query}, log_detail=f"query='{query}'"
+    )
 
 
 @app.route('/api/knowledge/browse', methods=['GET'])
@@ -179,39 +449,18 @@ def knowledge_browse():
     Compliance-based filtering is applied automatically per company.
         path: Path to browse (optional, defaults to root)
     """
-    logger = get_helm_logger()
-
     path = request.args.get('path', '')
 
     # Validate path to prevent traversal attacks
     if '..' in path:
         return jsonify({'error': 'Invalid path'}), 400
 
-    try:
-        # Call KnowledgeTree service API endpoint (URL-encode path to prevent injection)
-        safe_path = quote(path, safe="/") if path else ''
-        endpoint = f'/api/browse?path=/{safe_path}' if safe_path else '/api/browse?path=/'
-        response = call_service('knowledgetree', endpoint)
-
-        if response.status_code == 200:
-            data = response.json()
-
-            # Apply Presidio filtering
-            filtered_data = apply_company_filtering(data)
-
-            logger.info(f"Knowledge browse completed: path='{path}'")
-
-            return jsonify({
-                'path': path,
-                'data': filtered_data
-            })
-        else:
-            logger.error(f"KnowledgeTree browse failed: {response.status_code}")
-            return jsonify({'error': 'KnowledgeTree browse failed'}), response.status_code
-
-    except Exception as e:
-        logger.error(f"Error calling KnowledgeTree: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+    return proxy_service_get(
+        'knowledgetree', '/api/browse',
+        'KnowledgeTree browse', 'KnowledgeTree browse failed',
+        params={'path': '/' + path}, extra={'path': path},
+        log_detail=f"path='{path}'", cache_ttl=30
+    )
 
 
 @app.route('/api/knowledge/node/<int:node_id>', methods=['GET'])
@@ -222,32 +471,11 @@ def knowledge_node(node_id: int):
 
     Compliance-based filtering is applied automatically per company.
     """
-    logger = get_helm_logger()
-
-
-    try:
-        # Call KnowledgeTree service
-        response = call_service('knowledgetree', f'/api/node/{node_id}')
-
-        if response.status_code == 200:
-            data = response.json()
-
-            # Apply Presidio filtering
-            filtered_data = apply_company_filtering(data)
-
-            logger.info(f"Knowledge node retrieved: node_id={node_id}")
-
-            return jsonify({
-                'node_id': node_id,
-                'data': filtered_data
-            })
-        else:
-            logger.error(f"KnowledgeTree node retrieval failed: {response.status_code}")
-            return jsonify({'error': 'Node not found'}), response.status_code
-
-    except Exception as e:
-        logger.error(f"Error calling KnowledgeTree: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+    return proxy_service_get(
+        'knowledgetree', f'/api/node/{node_id}',
+        'KnowledgeTree node retrieval', 'Node not found',
+        extra={'node_id': node_id}, log_detail=f"node_id={node_id}"
+    )
 
 
 # ==================== Codex Integration ====================
@@ -260,31 +488,11 @@ def codex_companies():
 
     Compliance-based filtering is applied automatically per company.
     """
-    logger = get_helm_logger()
-
-
-    try:
-        # Call Codex service
-        response = call_service('codex', '/api/companies')
-
-        if response.status_code == 200:
-            data = response.json()
-
-            # Apply Presidio filtering
-            filtered_data = apply_company_filtering(data)
-
-            logger.info(f"Codex companies retrieved: count={len(data) if isinstance(data, list) else 'N/A'}")
-
-            return jsonify({
-                'data': filtered_data
-            })
-        else:
-            logger.error(f"Codex companies retrieval failed: {response.status_code}")
-            return jsonify({'error': 'Codex companies retrieval failed'}), response.status_code
-
-    except Exception as e:
-        logger.error(f"Error calling Codex: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+    return proxy_service_get(
+        'codex', '/api/companies',
+        'Codex companies retrieval', 'Codex companies retrieval failed',
+        cache_ttl=30
+    )
 
 
 @app.route('/api/codex/company/<int:company_id>', methods=['GET'])
@@ -295,36 +503,17 @@ def codex_company(company_id: int):
 
     Compliance-based filtering is applied automatically per company.
     """
-    logger = get_helm_logger()
-
-
-    try:
-        # Call Codex service
-        response = call_service('codex', f'/api/company/{company_id}')
-
-        if response.status_code == 200:
-            data = response.json()
-
-            # Apply Presidio filtering
-            filtered_data = apply_company_filtering(data)
-
-            logger.info(f"Codex company retrieved: company_id={company_id}")
-
-            return jsonify({
-                'company_id': company_id,
-                'data': filtered_data
-            })
-        else:
-            logger.error(f"Codex company retrieval failed: {response.status_code}")
-            return jsonify({'error': 'Company not found'}), response.status_code
-
-    except Exception as e:
-        logger.error(f"Error calling Codex: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+    return proxy_service_get(
+        'codex', f'/api/company/{company_id}',
+        'Codex company retrieval', 'Company not found',
+        extra={'company_id': company_id}, log_detail=f"company_id={company_id}",
+        cache_ttl=30
+    )
 
 
 @app.route('/api/codex/tickets', methods=['GET'])
 @token_required
+@limiter.limit(EXPENSIVE_ENDPOINT_LIMIT)
 def codex_tickets():
     """
     Get tickets from Codex with filtering.
@@ -333,44 +522,21 @@ def codex_tickets():
         company_id: Filter by company ID (optional)
         status: Filter by status (optional)
     """
-    logger = get_helm_logger()
-
     company_id = request.args.get('company_id')
     status = request.args.get('status')
 
-    try:
-        # Build query parameters
-        params = []
-        if company_id:
-            params.append(f'company_id={company_id}')
-        if status:
-            params.append(f'status={status}')
-
-        endpoint = '/api/tickets'
-        if params:
-            endpoint += '?' + '&'.join(params)
-
-        # Call Codex service
-        response = call_service('codex', endpoint)
-
-        if response.status_code == 200:
-            data = response.json()
-
-            # Apply Presidio filtering
-            filtered_data = apply_company_filtering(data)
-
-            logger.info(f"Codex tickets retrieved: count={len(data) if isinstance(data, list) else 'N/A'}")
-
-            return jsonify({
-                'data': filtered_data
-            })
-        else:
-            logger.error(f"Codex tickets retrieval failed: {response.status_code}")
-            return jsonify({'error': 'Codex tickets retrieval failed'}), response.status_code
-
-    except Exception as e:
-        logger.error(f"Error calling Codex: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+    # Build query parameters
+    params = {}
+    if company_id:
+        params['company_id'] = company_id
+    if status:
+        params['status'] = status
+
+    return proxy_service_get(
+        'codex', '/api/tickets',
+        'Codex tickets retrieval', 'Codex tickets retrieval failed',
+        params=params
+    )
 
 
 @app.route('/api/codex/contacts', methods=['GET'])
@@ -382,37 +548,15 @@ def codex_contacts():
     Compliance-based filtering is applied automatically per company.
         company_id: Filter by company ID (optional)
     """
-    logger = get_helm_logger()
-
     company_id = request.args.get('company_id')
 
-    try:
-        # Build endpoint
-        endpoint = '/api/contacts'
-        if company_id:
-            endpoint += f'?company_id={company_id}'
-
-        # Call Codex service
-        response = call_service('codex', endpoint)
-
-        if response.status_code == 200:
-            data = response.json()
-
-            # Apply Presidio filtering
-            filtered_data = apply_company_filtering(data)
-
-            logger.info(f"Codex contacts retrieved: count={len(filtered_data) if isinstance(filtered_data, list) else 'N/A'}")
-
-            return jsonify({
-                'data': filtered_data
-            })
-        else:
-            logger.error(f"Codex contacts retrieval failed: {response.status_code}")
-            return jsonify({'error': 'Contacts retrieval failed'}), response.status_code
+    params = {'company_id': company_id} if company_id else None
 
-    except Exception as e:
-        logger.error(f"Error calling Codex: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+    return proxy_service_get(
+        'codex', '/api/contacts',
+        'Codex contacts retrieval', 'Contacts retrieval failed',
+        params=params
+    )
 
 
 @app.route('/api/codex/contact/<int:contact_id>', methods=['GET'])
@@ -423,32 +567,11 @@ def codex_contact(contact_id: int):
 
     Compliance-based filtering is applied automatically per company.
     """
-    logger = get_helm_logger()
-
-
-    try:
-        # Call Codex service
-        response = call_service('codex', f'/api/contact/{contact_id}')
-
-        if response.status_code == 200:
-            data = response.json()
-
-            # Apply Presidio filtering
-            filtered_data = apply_company_filtering(data)
-
-            logger.info(f"Codex contact retrieved: contact_id={contact_id}")
-
-            return jsonify({
-                'contact_id': contact_id,
-                'data': filtered_data
-            })
-        else:
-            logger.error(f"Codex contact retrieval failed: {response.status_code}")
-            return jsonify({'error': 'Contact not found'}), response.status_code
-
-    except Exception as e:
-        logger.error(f"Error calling Codex: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+    return proxy_service_get(
+        'codex', f'/api/contact/{contact_id}',
+        'Codex contact retrieval', 'Contact not found',
+        extra={'contact_id': contact_id}, log_detail=f"contact_id={contact_id}"
+    )
 
 
 @app.route('/api/codex/assets', methods=['GET'])
@@ -460,37 +583,15 @@ def codex_assets():
     Compliance-based filtering is applied automatically per company.
         company_id: Filter by company ID (optional)
     """
-    logger = get_helm_logger()
-
     company_id = request.args.get('company_id')
 
-    try:
-        # Build endpoint
-        endpoint = '/api/assets'
-        if company_id:
-            endpoint += f'?company_id={company_id}'
-
-        # Call Codex service
-        response = call_service('codex', endpoint)
-
-        if response.status_code == 200:
-            data = response.json()
-
-            # Apply Presidio filtering
-            filtered_data = apply_company_filtering(data)
-
-            logger.info(f"Codex assets retrieved: count={len(filtered_data) if isinstance(filtered_data, list) else 'N/A'}")
+    params = {'company_id': company_id} if company_id else None
 
-            return jsonify({
-                'data': filtered_data
-            })
-        else:
-            logger.error(f"Codex assets retrieval failed: {response.status_code}")
-            return jsonify({'error': 'Assets retrieval failed'}), response.status_code
-
-    except Exception as e:
-        logger.error(f"Error calling Codex: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+    return proxy_service_get(
+        'codex', '/api/assets',
+        'Codex assets retrieval', 'Assets retrieval failed',
+        params=params
+    )
 
 
 @app.route('/api/codex/asset/<int:asset_id>', methods=['GET'])
@@ -501,32 +602,11 @@ def codex_asset(asset_id: int):
 
     Compliance-based filtering is applied automatically per company.
     """
-    logger = get_helm_logger()
-
-
-    try:
-        # Call Codex service
-        response = call_service('codex', f'/api/asset/{asset_id}')
-
-        if response.status_code == 200:
-            data = response.json()
-
-            # Apply Presidio filtering
-            filtered_data = apply_company_filtering(data)
-
-            logger.info(f"Codex asset retrieved: asset_id={asset_id}")
-
-            return jsonify({
-                'asset_id': asset_id,
-                'data': filtered_data
-            })
-        else:
-            logger.error(f"Codex asset retrieval failed: {response.status_code}")
-            return jsonify({'error': 'Asset not found'}), response.status_code
-
-    except Exception as e:
-        logger.error(f"Error calling Codex: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+    return proxy_service_get(
+        'codex', f'/api/asset/{asset_id}',
+        'Codex asset retrieval', 'Asset not found',
+        extra={'asset_id': asset_id}, log_detail=f"asset_id={asset_id}"
+    )
 
 
 # ==================== Codex Ticket Integration ====================
@@ -539,33 +619,11 @@ def codex_ticket(ticket_id: int):
 
     Compliance-based filtering is applied automatically per company.
     """
-    logger = get_helm_logger()
-
-
-    try:
-        # Call Codex service
-        response = call_service('codex', f'/api/ticket/{ticket_id}')
-
-        if response.status_code == 200:
-            data = response.json()
-
-            # Apply Presidio filtering
-            filtered_data = apply_company_filtering(data)
-
-            logger.info(f"Codex ticket retrieved: ticket_id={ticket_id}")
-
-            return jsonify({
-                'source': 'codex',
-                'ticket_id': ticket_id,
-                'data': filtered_data
-            })
-        else:
-            logger.error(f"Codex ticket retrieval failed: {response.status_code}")
-            return jsonify({'error': 'Ticket not found'}), response.status_code
-
-    except Exception as e:
-        logger.error(f"Error calling Codex: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+    return proxy_service_get(
+        'codex', f'/api/ticket/{ticket_id}',
+        'Codex ticket retrieval', 'Ticket not found',
+        extra={'source': 'codex', 'ticket_id': ticket_id}, log_detail=f"ticket_id={ticket_id}"
+    )
 
 
 # ==================== Beacon Integration ====================
@@ -580,39 +638,19 @@ def beacon_tickets():
         status: Optional status filter
         limit: Number of results to return (optional)
     """
-    logger = get_helm_logger()
-
     status = request.args.get('status')
-    limit = request.args.get('limit', '50')
+    limit = _limit_arg()
 
-    try:
-        # Build query parameters
-        params = {'limit': limit}
-        if status:
-            params['status'] = status
-
-        # Call Beacon service
-        response = call_service('beacon', '/api/tickets', params=params)
-
-        if response.status_code == 200:
-            data = response.json()
+    # Build query parameters
+    params = {'limit': limit}
+    if status:
+        params['status'] = status
 
-            # Apply Presidio filtering
-            filtered_data = apply_company_filtering(data)
-
-            logger.info(f"Beacon tickets retrieved: count={len(filtered_data) if isinstance(filtered_data, list) else 'N/A'}")
-
-            return jsonify({
-                'source': 'beacon',
-                'data': filtered_data
-            })
-        else:
-            logger.error(f"Beacon tickets retrieval failed: {response.status_code}")
-            return jsonify({'error': 'Beacon tickets retrieval failed'}), response.status_code
-
-    except Exception as e:
-        logger.error(f"Error calling Beacon: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+    return proxy_service_get(
+        'beacon', '/api/tickets',
+        'Beacon tickets retrieval', 'Beacon tickets retrieval failed',
+        params=params, extra={'source': 'beacon'}
+    )
 
 
 @app.route('/api/beacon/ticket/<int:ticket_id>', methods=['GET'])
@@ -623,33 +661,11 @@ def beacon_ticket(ticket_id: int):
 
     Compliance-based filtering is applied automatically per company.
     """
-    logger = get_helm_logger()
-
-
-    try:
-        # Call Beacon service
-        response = call_service('beacon', f'/api/ticket/{ticket_id}')
-
-        if response.status_code == 200:
-            data = response.json()
-
-            # Apply Presidio filtering
-            filtered_data = apply_company_filtering(data)
-
-            logger.info(f"Beacon ticket retrieved: ticket_id={ticket_id}")
-
-            return jsonify({
-                'source': 'beacon',
-                'ticket_id': ticket_id,
-                'data': filtered_data
-            })
-        else:
-            logger.error(f"Beacon ticket retrieval failed: {response.status_code}")
-            return jsonify({'error': 'Ticket not found'}), response.status_code
-
-    except Exception as e:
-        logger.error(f"Error calling Beacon: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+    return proxy_service_get(
+        'beacon', f'/api/ticket/{ticket_id}',
+        'Beacon ticket retrieval', 'Ticket not found',
+        extra={'source': 'beacon', 'ticket_id': ticket_id}, log_detail=f"ticket_id={ticket_id}"
+    )
 
 
 @app.route('/api/beacon/dashboard', methods=['GET'])
@@ -660,38 +676,18 @@ def beacon_dashboard():
 
     Compliance-based filtering is applied automatically per company.
     """
-    logger = get_helm_logger()
-
-
-    try:
-        # Call Beacon service
-        response = call_service('beacon', '/api/dashboard')
-
-        if response.status_code == 200:
-            data = response.json()
-
-            # Apply Presidio filtering
-            filtered_data = apply_company_filtering(data)
-
-            logger.info("Beacon dashboard retrieved")
-
-            return jsonify({
-                'source': 'beacon',
-                'data': filtered_data
-            })
-        else:
-            logger.error(f"Beacon dashboard retrieval failed: {response.status_code}")
-            return jsonify({'error': 'Dashboard retrieval failed'}), response.status_code
-
-    except Exception as e:
-        logger.error(f"Error calling Beacon: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+    return proxy_service_get(
+        'beacon', '/api/dashboard',
+        'Beacon dashboard retrieval', 'Dashboard retrieval failed',
+        extra={'source': 'beacon'}, cache_ttl=30
+    )
 
 
 # ==================== Archive Integration ====================
 
 @app.route('/api/archive/search', methods=['GET'])
 @token_required
+@limiter.limit(EXPENSIVE_ENDPOINT_LIMIT, cost=_result_limit_cost)
 def archive_search():
     """
     Search archived data with filtering.
@@ -700,35 +696,15 @@ def archive_search():
         q: Search query
         limit: Number of results to return (optional)
     """
-    logger = get_helm_logger()
-
     query = request.args.get('q', '')
-    limit = request.args.get('limit', '50')
-
-    try:
-        # Call Archive service
-        response = call_service('archive', '/api/search', params={'q': query, 'limit': limit})
-
-        if response.status_code == 200:
-            data = response.json()
-
-            # Apply Presidio filtering
-            filtered_data = apply_company_filtering(data)
-
-            logger.info(f"Archive search completed: query='{query}'")
-
-            return jsonify({
-                'source': 'archive',
-                'query': query,
-                'data': filtered_data
-            })
-        else:
-            logger.error(f"Archive search failed: {response.status_code}")
-            return jsonify({'error': 'Archive search failed'}), response.status_code
+    limit = _limit_arg()
 
-    except Exception as e:
-        logger.error(f"Error calling Archive: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+    return proxy_service_get(
+        'archive', '/api/search',
+        'Archive search', 'Archive search failed',
+        params={'q': query, 'limit': limit},
+        extra={'source': 'archive', 'query': query}, log_detail=f"query='{query}'"
+    )
 
 
 @app.route('/api/archive/items', methods=['GET'])
@@ -740,33 +716,13 @@ def archive_items():
     Compliance-based filtering is applied automatically per company.
         limit: Number of results to return (optional)
     """
-    logger = get_helm_logger()
-
-    limit = request.args.get('limit', '50')
-
-    try:
-        # Call Archive service
-        response = call_service('archive', '/api/items', params={'limit': limit})
-
-        if response.status_code == 200:
-            data = response.json()
-
-            # Apply Presidio filtering
-            filtered_data = apply_company_filtering(data)
-
-            logger.info(f"Archive items retrieved: count={len(filtered_data) if isinstance(filtered_data, list) else 'N/A'}")
-
-            return jsonify({
-                'source': 'archive',
-                'data': filtered_data
-            })
-        else:
-            logger.error(f"Archive items retrieval failed: {response.status_code}")
-            return jsonify({'error': 'Archive items retrieval failed'}), response.status_code
+    limit = _limit_arg()
 
-    except Exception as e:
-        logger.error(f"Error calling Archive: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+    return proxy_service_get(
+        'archive', '/api/items',
+        'Archive items retrieval', 'Archive items retrieval failed',
+        params={'limit': limit}, extra={'source': 'archive'}
+    )
 
 
 @app.route('/api/archive/item/<int:item_id>', methods=['GET'])
@@ -777,33 +733,11 @@ def archive_item(item_id: int):
 
     Compliance-based filtering is applied automatically per company.
     """
-    logger = get_helm_logger()
-
-
-    try:
-        # Call Archive service
-        response = call_service('archive', f'/api/item/{item_id}')
-
-        if response.status_code == 200:
-            data = response.json()
-
-            # Apply Presidio filtering
-            filtered_data = apply_company_filtering(data)
-
-            logger.info(f"Archive item retrieved: item_id={item_id}")
-
-            return jsonify({
-                'source': 'archive',
-                'item_id': item_id,
-                'data': filtered_data
-            })
-        else:
-            logger.error(f"Archive item retrieval failed: {response.status_code}")
-            return jsonify({'error': 'Item not found'}), response.status_code
-
-    except Exception as e:
-        logger.error(f"Error calling Archive: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+    return proxy_service_get(
+        'archive', f'/api/item/{item_id}',
+        'Archive item retrieval', 'Item not found',
+        extra={'source': 'archive', 'item_id': item_id}, log_detail=f"item_id={item_id}"
+    )
 
 
 # ==================== Ledger Billing Integration ====================
@@ -818,9 +752,6 @@ def ledger_billing(account_number: str):
         year: Billing year (optional)
         month: Billing month (optional)
     """
-    logger = get_helm_logger()
-
-    from .ledger_client import get_ledger_client
     ledger = get_ledger_client()
 
     year = request.args.get('year', type=int)
@@ -844,11 +775,70 @@ def ledger_billing(account_number: str):
 
     except Exception as e:
         logger.error(f"Error fetching billing data: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return internal_error_json()
+
+
+@app.route('/api/ledger/billing/bulk', methods=['POST'])
+@token_required
+@limiter.limit(EXPENSIVE_ENDPOINT_LIMIT)
+def ledger_billing_bulk():
+    """
+    Get billing data for several companies in one request.
+
+    Compliance-based filtering is applied automatically per company.
+
+    Request body:
+    {
+        "account_numbers": ["620547", "620548"],
+        "year": 2025,   // optional
+        "month": 10     // optional
+    }
+    """
+    ledger = get_ledger_client()
+
+    data, error = _json_body('account_numbers', error='account_numbers required')
+    if error:
+        return error
+
+    account_numbers = data['account_numbers']
+    if not isinstance(account_numbers, list) or not account_numbers:
+        return jsonify({'error': 'account_numbers required'}), 400
+    if len(account_numbers) > MAX_BULK_ACCOUNTS:
+        return jsonify({
+            'error': f'At most {MAX_BULK_ACCOUNTS} account_numbers per request'
+        }), 400
+    if any(isinstance(account_number, bool) or not isinstance(account_number, (str, int))
+           for account_number in account_numbers):
+        return jsonify({'error': 'account_numbers must be strings or integers'}), 400
+
+    # Dedupe after normalizing, so 620547 and "620547" are one account
+    account_numbers = list(dict.fromkeys(str(account_number) for account_number in account_numbers))
+
+    try:
+        billing = ledger.get_billing_bulk(account_numbers, data.get('year'), data.get('month'))
+
+        results = {}
+        errors = {}
+        for account_number, account_data in billing.items():
+            if isinstance(account_data, dict) and 'error' in account_data:
+                errors[account_number] = account_data['error']
+            else:
+                results[account_number] = apply_company_filtering(account_data)
+
+        logger.info(f"Retrieved billing data for {len(results)} of {len(account_numbers)} accounts")
+        return jsonify({
+            'data': results,
+            'errors': errors
+        })
+
+    except Exception as e:
+        logger.error(f"Error fetching bulk billing data: {e}")
+        return internal_error_json()
 
 
 @app.route('/api/ledger/dashboard', methods=['GET'])
 @token_required
+@limiter.limit(EXPENSIVE_ENDPOINT_LIMIT)
 def ledger_dashboard():
     """
     Get billing dashboard for all companies.
@@ -857,9 +847,6 @@ def ledger_dashboard():
         year: Billing year (optional)
         month: Billing month (optional)
     """
-    logger = get_helm_logger()
-
-    from .ledger_client import get_ledger_client
     ledger = get_ledger_client()
 
     year = request.args.get('year', type=int)
@@ -881,16 +868,13 @@ def ledger_dashboard():
 
     except Exception as e:
         logger.error(f"Error fetching dashboard: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return internal_error_json()
 
 
 @app.route('/api/ledger/plans', methods=['GET'])
 @token_required
 def ledger_plans():
     """Get all available billing plans from Ledger."""
-    logger = get_helm_logger()
-
-    from .ledger_client import get_ledger_client
     ledger = get_ledger_client()
 
     try:
@@ -900,16 +884,13 @@ def ledger_plans():
 
     except Exception as e:
         logger.error(f"Error fetching plans: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return internal_error_json()
 
 
 @app.route('/api/ledger/overrides/client/<account_number>', methods=['GET'])
 @token_required
 def get_client_overrides(account_number: str):
     """Get billing overrides for a specific client."""
-    logger = get_helm_logger()
-
-    from .ledger_client import get_ledger_client
     ledger = get_ledger_client()
 
     try:
@@ -919,7 +900,7 @@ def get_client_overrides(account_number: str):
 
     except Exception as e:
         logger.error(f"Error fetching overrides: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return internal_error_json()
 
 
 @app.route('/api/ledger/overrides/client/<account_number>', methods=['PUT', 'POST'])
@@ -943,15 +924,11 @@ def set_client_overrides(account_number: str):
         "prepaid_hours_yearly": 48.0
     }
     """
-    logger = get_helm_logger()
-
-    from .ledger_client import get_ledger_client
     ledger = get_ledger_client()
 
-    data = request.get_json()
-
-    if not data:
-        return jsonify({'error': 'No data provided'}), 400
+    data, error = _json_body()
+    if error:
+        return error
 
     try:
         result = ledger.set_client_override(account_number, data)
@@ -960,16 +937,13 @@ def set_client_overrides(account_number: str):
 
     except Exception as e:
         logger.error(f"Error setting overrides: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return internal_error_json()
 
 
 @app.route('/api/ledger/overrides/client/<account_number>', methods=['DELETE'])
 @token_required
 def delete_client_overrides_route(account_number: str):
     """Remove all billing overrides for a client."""
-    logger = get_helm_logger()
-
-    from .ledger_client import get_ledger_client
     ledger = get_ledger_client()
 
     try:
@@ -979,21 +953,21 @@ def delete_client_overrides_route(account_number: str):
 
     except Exception as e:
         logger.error(f"Error deleting overrides: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return internal_error_json()
 
 
 @app.route('/api/ledger/manual-assets/<account_number>', methods=['GET'])
 @token_required
 def get_manual_assets(account_number: str):
     """Get manual assets for a company."""
-    from .ledger_client import get_ledger_client
     ledger = get_ledger_client()
 
     try:
         assets = ledger.get_manual_assets(account_number)
-        return jsonify({'manual_assets': assets})
+        return conditional_json({'manual_assets': assets})
     except Exception as e:
-        return jsonify({'error': 'Internal server error'}), 500
+        logger.error(f"Error fetching manual assets: {e}")
+        return internal_error_json()
 
 
 @app.route('/api/ledger/manual-assets/<account_number>', methods=['POST'])
@@ -1010,13 +984,11 @@ def add_manual_asset(account_number: str):
         "notes": "Legacy server"  // optional
     }
     """
-    from .ledger_client import get_ledger_client
     ledger = get_ledger_client()
 
-    data = request.get_json()
-
-    if not data or 'hostname' not in data or 'billing_type' not in data:
-        return jsonify({'error': 'hostname and billing_type required'}), 400
+    data, error = _json_body('hostname', 'billing_type', error='hostname and billing_type required')
+    if error:
+        return error
 
     try:
         result = ledger.add_manual_asset(
@@ -1028,35 +1000,36 @@ def add_manual_asset(account_number: str):
         )
         return jsonify(result)
     except Exception as e:
-        return jsonify({'error': 'Internal server error'}), 500
+        logger.error(f"Error adding manual asset: {e}")
+        return internal_error_json()
 
 
 @app.route('/api/ledger/manual-assets/<account_number>/<int:asset_id>', methods=['DELETE'])
 @token_required
 def delete_manual_asset(account_number: str, asset_id: int):
     """Delete a manual asset."""
-    from .ledger_client import get_ledger_client
     ledger = get_ledger_client()
 
     try:
         result = ledger.delete_manual_asset(account_number, asset_id)
         return jsonify(result)
     except Exception as e:
-        return jsonify({'error': 'Internal server error'}), 500
+        logger.error(f"Error deleting manual asset: {e}")
+        return internal_error_json()
 
 
 @app.route('/api/ledger/manual-users/<account_number>', methods=['GET'])
 @token_required
 def get_manual_users(account_number: str):
     """Get manual users for a company."""
-    from .ledger_client import get_ledger_client
     ledger = get_ledger_client()
 
     try:
         users = ledger.get_manual_users(account_number)
-        return jsonify({'manual_users': users})
+        return conditional_json({'manual_users': users})
     except Exception as e:
-        return jsonify({'error': 'Internal server error'}), 500
+        logger.error(f"Error fetching manual users: {e}")
+        return internal_error_json()
 
 
 @app.route('/api/ledger/manual-users/<account_number>', methods=['POST'])
@@ -1073,13 +1046,12 @@ def add_manual_user(account_number: str):
         "notes": "Executive user"  // optional
     }
     """
-    from .ledger_client import get_ledger_client
     ledger = get_ledger_client()
 
-    data = request.get_json()
-
-    if not data or 'full_name' not in data or 'billing_type' not in data:
-        return jsonify({'error': 'full_name and billing_type required'}), 400
+    data, error = _json_body('full_name', 'billing_type',
+                             error='full_name and billing_type required')
+    if error:
+        return error
 
     try:
         result = ledger.add_manual_user(
@@ -1091,35 +1063,36 @@ def add_manual_user(account_number: str):
         )
         return jsonify(result)
     except Exception as e:
-        return jsonify({'error': 'Internal server error'}), 500
+        logger.error(f"Error adding manual user: {e}")
+        return internal_error_json()
 
 
 @app.route('/api/ledger/manual-users/<account_number>/<int:user_id>', methods=['DELETE'])
 @token_required
 def delete_manual_user(account_number: str, user_id: int):
     """Delete a manual user."""
-    from .ledger_client import get_ledger_client
     ledger = get_ledger_client()
 
     try:
         result = ledger.delete_manual_user(account_number, user_id)
         return jsonify(result)
     except Exception as e:
-        return jsonify({'error': 'Internal server error'}), 500
+        logger.error(f"Error deleting manual user: {e}")
+        return internal_error_json()
 
 
 @app.route('/api/ledger/line-items/<account_number>', methods=['GET'])
 @token_required
 def get_line_items(account_number: str):
     """Get custom line items for a company."""
-    from .ledger_client import get_ledger_client
     ledger = get_ledger_client()
 
     try:
         items = ledger.get_custom_line_items(account_number)
-        return jsonify({'line_items': items})
+        return conditional_json({'line_items': items})
     except Exception as e:
-        return jsonify({'error': 'Internal server error'}), 500
+        logger.error(f"Error fetching line items: {e}")
+        return internal_error_json()
 
 
 @app.route('/api/ledger/line-items/<account_number>', methods=['POST'])
@@ -1140,52 +1113,50 @@ def add_line_item(account_number: str):
         "yearly_bill_month": 1  // required if yearly_fee set (1-12)
     }
     """
-    from .ledger_client import get_ledger_client
     ledger = get_ledger_client()
 
-    data = request.get_json()
-
-    if not data or 'name' not in data:
-        return jsonify({'error': 'name required'}), 400
+    data, error = _json_body('name', error='name required')
+    if error:
+        return error
 
     try:
         result = ledger.add_custom_line_item(account_number, **data)
         return jsonify(result)
     except Exception as e:
-        return jsonify({'error': 'Internal server error'}), 500
+        logger.error(f"Error adding line item: {e}")
+        return internal_error_json()
 
 
 @app.route('/api/ledger/line-items/<account_number>/<int:item_id>', methods=['PUT'])
 @token_required
 def update_line_item(account_number: str, item_id: int):
     """Update a custom line item (same fields as POST)."""
-    from .ledger_client import get_ledger_client
     ledger = get_ledger_client()
 
-    data = request.get_json()
-
-    if not data:
-        return jsonify({'error': 'No data provided'}), 400
+    data, error = _json_body()
+    if error:
+        return error
 
     try:
         result = ledger.update_custom_line_item(account_number, item_id, **data)
         return jsonify(result)
     except Exception as e:
-        return jsonify({'error': 'Internal server error'}), 500
+        logger.error(f"Error updating line item: {e}")
+        return internal_error_json()
 
 
 @app.route('/api/ledger/line-items/<account_number>/<int:item_id>', methods=['DELETE'])
 @token_required
 def delete_line_item(account_number: str, item_id: int):
     """Delete a custom line item."""
-    from .ledger_client import get_ledger_client
     ledger = get_ledger_client()
 
     try:
         result = ledger.delete_custom_line_item(account_number, item_id)
         return jsonify(result)
     except Exception as e:
-        return jsonify({'error': 'Internal server error'}), 500
+        logger.error(f"Error deleting line item: {e}")
+        return internal_error_json()
 
 
 @app.route('/api/ledger/invoice/<account_number>/summary', methods=['GET'])
@@ -1198,7 +1169,6 @@ def get_invoice_summary(account_number: str):
         year: Invoice year (required)
         month: Invoice month (required)
     """
-    from .ledger_client import get_ledger_client
     ledger = get_ledger_client()
 
     year = request.args.get('year', type=int)
@@ -1209,9 +1179,10 @@ def get_invoice_summary(account_number: str):
 
     try:
         result = ledger.get_invoice_summary(account_number, year, month)
-        return jsonify(result)
+        return conditional_json(result)
     except Exception as e:
-        return jsonify({'error': 'Internal server error'}), 500
+        logger.error(f"Error fetching invoice summary: {e}")
+        return internal_error_json()
 
 
 @app.route('/api/ledger/bill/accept', methods=['POST'])
@@ -1228,13 +1199,12 @@ def accept_bill():
         "notes": "Approved by manager"  // optional
     }
     """
-    from .ledger_client import get_ledger_client
     ledger = get_ledger_client()
 
-    data = request.get_json()
-
-    if not data or 'account_number' not in data or 'year' not in data or 'month' not in data:
-        return jsonify({'error': 'account_number, year, and month required'}), 400
+    data, error = _json_body('account_number', 'year', 'month',
+                             error='account_number, year, and month required')
+    if error:
+        return error
 
     try:
         result = ledger.accept_bill(
@@ -1245,7 +1215,8 @@ def accept_bill():
         )
         return jsonify(result)
     except Exception as e:
-        return jsonify({'error': 'Internal server error'}), 500
+        logger.error(f"Error accepting bill: {e}")
+        return internal_error_json()
 
 
 # ==================== Contract Alignment Tool ====================
@@ -1264,15 +1235,12 @@ def analyze_contract():
 
     Returns current settings and recommendations.
     """
-    logger = get_helm_logger()
-
-    from .contract_alignment import get_contract_alignment_tool
     tool = get_contract_alignment_tool()
 
-    data = request.get_json()
-
-    if not data or 'account_number' not in data or 'contract_text' not in data:
-        return jsonify({'error': 'account_number and contract_text required'}), 400
+    data, error = _json_body('account_number', 'contract_text',
+                             error='account_number and contract_text required')
+    if error:
+        return error
 
     try:
         result = tool.analyze_contract(data['contract_text'], data['account_number'])
@@ -1280,7 +1248,7 @@ def analyze_contract():
         return jsonify(result)
     except Exception as e:
         logger.error(f"Error analyzing contract: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return internal_error_json()
 
 
 @app.route('/api/contract/current-settings/<account_number>', methods=['GET'])
@@ -1291,18 +1259,15 @@ def get_current_billing_settings(account_number: str):
 
     Includes billing data, overrides, manual items, line items, etc.
     """
-    logger = get_helm_logger()
-
-    from .contract_alignment import get_contract_alignment_tool
     tool = get_contract_alignment_tool()
 
     try:
         result = tool.get_current_settings(account_number)
         logger.info(f"Retrieved current settings for {account_number}")
-        return jsonify(result)
+        return conditional_json(result)
     except Exception as e:
         logger.error(f"Error getting settings: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return internal_error_json()
 
 
 @app.route('/api/contract/compare', methods=['POST'])
@@ -1325,15 +1290,12 @@ def compare_contract_to_settings():
 
     Returns comparison report with discrepancies and recommendations.
     """
-    logger = get_helm_logger()
-
-    from .contract_alignment import get_contract_alignment_tool
     tool = get_contract_alignment_tool()
 
-    data = request.get_json()
-
-    if not data or 'account_number' not in data or 'contract_terms' not in data:
-        return jsonify({'error': 'account_number and contract_terms required'}), 400
+    data, error = _json_body('account_number', 'contract_terms',
+                             error='account_number and contract_terms required')
+    if error:
+        return error
 
     try:
         result = tool.compare_contract_to_settings(data['account_number'], data['contract_terms'])
@@ -1341,7 +1303,7 @@ def compare_contract_to_settings():
         return jsonify(result)
     except Exception as e:
         logger.error(f"Error comparing terms: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return internal_error_json()
 
 
 @app.route('/api/contract/align', methods=['POST'])
@@ -1370,15 +1332,12 @@ def align_billing_settings():
 
     Returns results of alignment operation.
     """
-    logger = get_helm_logger()
-
-    from .contract_alignment import get_contract_alignment_tool
     tool = get_contract_alignment_tool()
 
-    data = request.get_json()
-
-    if not data or 'account_number' not in data or 'adjustments' not in data:
-        return jsonify({'error': 'account_number and adjustments required'}), 400
+    data, error = _json_body('account_number', 'adjustments',
+                             error='account_number and adjustments required')
+    if error:
+        return error
 
     dry_run = data.get('dry_run', True)
 
@@ -1393,7 +1352,7 @@ def align_billing_settings():
         return jsonify(result)
     except Exception as e:
         logger.error(f"Error aligning settings: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return internal_error_json()
 
 
 @app.route('/api/contract/verify', methods=['POST'])
@@ -1414,15 +1373,12 @@ def verify_alignment():
 
     Returns verification report.
     """
-    logger = get_helm_logger()
-
-    from .contract_alignment import get_contract_alignment_tool
     tool = get_contract_alignment_tool()
 
-    data = request.get_json()
-
-    if not data or 'account_number' not in data or 'contract_terms' not in data:
-        return jsonify({'error': 'account_number and contract_terms required'}), 400
+    data, error = _json_body('account_number', 'contract_terms',
+                             error='account_number and contract_terms required')
+    if error:
+        return error
 
     try:
         result = tool.verify_alignment(data['account_number'], data['contract_terms'])
@@ -1430,11 +1386,60 @@ def verify_alignment():
         return jsonify(result)
     except Exception as e:
         logger.error(f"Error verifying alignment: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return internal_error_json()
 
 
 # ==================== Utility Endpoints ====================
 
+# Seconds to reuse the last health check result. Load balancers poll /health
+# every few seconds per instance; each check queries the database and Core, so
+# polls within this window get the stored response instead.
+HEALTH_CACHE_TTL = 5
+
+# Last health check result as (body, status code, monotonic time of the check),
+# and whether a request is currently refreshing it. The lock only guards reading
+# and swapping these; the check itself runs outside it.
+_health_result: Optional[tuple] = None
+_health_refreshing = False
+_health_lock = threading.Lock()
+
+
+def _get_health_checker() -> HealthChecker:
+    """Build the HealthChecker for this service (database is optional)."""
+    # Get database if available
+    try:
+        from extensions import db
+    except Exception:
+        db = None
+
+    return HealthChecker(
+        service_name='brainhair',
+        db=db,
+        dependencies=[
+            ('core', 'http://localhost:5000')
+        ]
+    )
+
+
+def _run_health_check() -> tuple:
+    """Run the health checks and return (body, status code, time of the check)."""
+    response, status_code = _get_health_checker().get_health()
+    return response.get_data(), status_code, time.monotonic()
+
+
+def _refresh_health() -> tuple:
+    """Run the health checks as the single refresher and store the result."""
+    global _health_result, _health_refreshing
+    try:
+        result = _run_health_check()
+        with _health_lock:
+            _health_result = result
+        return result
+    finally:
+        with _health_lock:
+            _health_refreshing = False
+
+
 @app.route('/health', methods=['GET'])
 @limiter.exempt
 def public_health():
@@ -1446,25 +1451,29 @@ def public_health():
     - Disk space
     - Core service availability
 
+    Results are reused for HEALTH_CACHE_TTL seconds. When they expire, one
+    request runs the checks while concurrent polls keep getting the previous
+    result, so a slow dependency never queues polls behind it.
+
     Returns:
         JSON: Detailed health status with HTTP 200 (healthy) or 503 (unhealthy/degraded)
     """
-    # Get database if available
-    try:
-        from extensions import db
-    except:
-        db = None
+    global _health_refreshing
+    with _health_lock:
+        cached = _health_result
+        expired = cached is None or time.monotonic() - cached[2] >= HEALTH_CACHE_TTL
+        refresh = expired and not _health_refreshing
+        if refresh:
+            _health_refreshing = True
 
-    # Initialize health checker
-    health_checker = HealthChecker(
-        service_name='brainhair',
-        db=db,
-        dependencies=[
-            ('core', 'http://localhost:5000')
-        ]
-    )
+    if refresh:
+        cached = _refresh_health()
+    elif cached is None:
+        # The first check is still running in another request; don't wait on it
+        cached = _run_health_check()
 
-    return health_checker.get_health()
+    body, status_code, _ = cached
+    return app.response_class(body, status=status_code, mimetype='application/json')
 
 
 @app.route('/api/health', methods=['GET'])
@@ -1475,6 +1484,80 @@ def health():
     return public_health()
 
 
+@app.route('/api/upstream-stats', methods=['GET'])
+@token_required
+def upstream_stats():
+    """
+    Latency histograms and error counts for calls to other HiveMatrix services.
+
+    Counts cover this worker process since it started, per upstream service
+    and calling route. Calls made by the agent tools run in the Claude
+    session's process and are not included. Use them to judge cache TTLs,
+    batch sizes and pool sizes against real upstream timings.
+    """
+    return jsonify(get_call_stats())
+
+
+# Static /api/endpoints payload, serialized once at import
+_API_ENDPOINTS = {
+    'knowledge': {
+        '/api/knowledge/search': 'Search KnowledgeTree',
+        '/api/knowledge/browse': 'Browse KnowledgeTree nodes',
+        '/api/knowledge/node/<id>': 'Get specific node details'
+    },
+    'codex': {
+        '/api/codex/companies': 'List all companies',
+        '/api/codex/company/<id>': 'Get company details',
+        '/api/codex/tickets': 'List tickets'
+    },
+    'psa': {
+        '/api/psa/tickets': 'List PSA tickets',
+        '/api/psa/ticket/<id>': 'Get specific ticket'
+    },
+    'rmm': {
+        '/api/rmm/devices': 'List devices from RMM (vendor-agnostic)',
+        '/api/rmm/device/<id>': 'Get specific device details'
+    },
+    'ledger': {
+        '/api/ledger/billing/<account_number>': 'Get billing data for company',
+        '/api/ledger/billing/bulk': 'Get billing data for several companies (POST)',
+        '/api/ledger/dashboard': 'Get billing dashboard for all companies',
+        '/api/ledger/plans': 'List all billing plans',
+        '/api/ledger/overrides/client/<account_number>': 'Get/set/delete client billing overrides',
+        '/api/ledger/manual-assets/<account_number>': 'Get/add manual assets',
+        '/api/ledger/manual-users/<account_number>': 'Get/add manual users',
+        '/api/ledger/line-items/<account_number>': 'Get/add/update/delete custom line items',
+        '/api/ledger/invoice/<account_number>/summary': 'Get invoice summary',
+        '/api/ledger/bill/accept': 'Accept and archive a bill'
+    },
+    'contract_alignment': {
+        '/api/contract/analyze': 'Analyze a contract and load current settings',
+        '/api/contract/current-settings/<account_number>':
+            'Get comprehensive current billing settings',
+        '/api/contract/compare': 'Compare contract terms with current settings',
+        '/api/contract/align': 'Align billing settings to match contract (dry_run supported)',
+        '/api/contract/verify': 'Verify alignment between contract and settings'
+    },
+    'utility': {
+        '/api/health': 'Health check',
+        '/api/upstream-stats': 'Upstream call latency histograms and error counts',
+        '/api/endpoints': 'List all endpoints'
+    }
+}
+
+_ENDPOINTS_BODY = (app.json.dumps({
+    'service': 'Brain Hair',
+    'description': 'AI-accessible API gateway with automatic PHI/CJIS filtering',
+    'endpoints': _API_ENDPOINTS,
+    'notes': {
+        'authentication': 'All endpoints require Bearer token authentication',
+        'filtering': 'Add ?filter=phi or ?filter=cjis to any endpoint. Default is PHI filtering.',
+        'base_url': 'Access via Nexus: https://your-server/brainhair'
+    }
+}) + "\n").encode('utf-8')
+_ENDPOINTS_ETAG = hashlib.blake2b(_ENDPOINTS_BODY, digest_size=16).hexdigest()
+
+
 @app.route('/api/endpoints', methods=['GET'])
 @token_required
 def list_endpoints():
@@ -1482,56 +1565,6 @@ def list_endpoints():
     List all available API endpoints.
     Useful for Claude to discover what tools are available.
     """
-    endpoints = {
-        'knowledge': {
-            '/api/knowledge/search': 'Search KnowledgeTree',
-            '/api/knowledge/browse': 'Browse KnowledgeTree nodes',
-            '/api/knowledge/node/<id>': 'Get specific node details'
-        },
-        'codex': {
-            '/api/codex/companies': 'List all companies',
-            '/api/codex/company/<id>': 'Get company details',
-            '/api/codex/tickets': 'List tickets'
-        },
-        'psa': {
-            '/api/psa/tickets': 'List PSA tickets',
-            '/api/psa/ticket/<id>': 'Get specific ticket'
-        },
-        'rmm': {
-            '/api/rmm/devices': 'List devices from RMM (vendor-agnostic)',
-            '/api/rmm/device/<id>': 'Get specific device details'
-        },
-        'ledger': {
-            '/api/ledger/billing/<account_number>': 'Get billing data for company',
-            '/api/ledger/dashboard': 'Get billing dashboard for all companies',
-            '/api/ledger/plans': 'List all billing plans',
-            '/api/ledger/overrides/client/<account_number>': 'Get/set/delete client billing overrides',
-            '/api/ledger/manual-assets/<account_number>': 'Get/add manual assets',
-            '/api/ledger/manual-users/<account_number>': 'Get/add manual users',
-            '/api/ledger/line-items/<account_number>': 'Get/add/update/delete custom line items',
-            '/api/ledger/invoice/<account_number>/summary': 'Get invoice summary',
-            '/api/ledger/bill/accept': 'Accept and archive a bill'
-        },
-        'contract_alignment': {
-            '/api/contract/analyze': 'Analyze a contract and load current settings',
-            '/api/contract/current-settings/<account_number>': 'Get comprehensive current billing settings',
-            '/api/contract/compare': 'Compare contract terms with current settings',
-            '/api/contract/align': 'Align billing settings to match contract (dry_run supported)',
-            '/api/contract/verify': 'Verify alignment between contract and settings'
-        },
-        'utility': {
-            '/api/health': 'Health check',
-            '/api/endpoints': 'List all endpoints'
-        }
-    }
-
-    return jsonify({
-        'service': 'Brain Hair',
-        'description': 'AI-accessible API gateway with automatic PHI/CJIS filtering',
-        'endpoints': endpoints,
-        'notes': {
-            'authentication': 'All endpoints require Bearer token authentication',
-            'filtering': 'Add ?filter=phi or ?filter=cjis to any endpoint. Default is PHI filtering.',
-            'base_url': 'Access via Nexus: https://your-server/brainhair'
-        }
-    })
+    response = app.response_class(_ENDPOINTS_BODY, mimetype='application/json')
+    response.set_etag(_ENDPOINTS_ETAG)
+    return response.make_conditional(request)
@@ -11,13 +11,44 @@ Usage:
 """
 
 import requests
-from flask import current_app
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app, copy_current_request_context, g, has_request_context, request
+from bisect import bisect_left
+import orjson
+import threading
 import time
 import jwt
 
 # Token cache: {target_service: {'token': str, 'expires_at': float}}
 _token_cache = {}
 
+# Shared session so TCP/TLS connections to Core and other services are kept
+# alive and reused across requests instead of being set up per call.
+# Failed connection attempts are retried briefly; read timeouts are not, so a
+# stalled upstream holds a worker for one read timeout rather than several.
+# (Pooled connections the peer has closed are dropped by urllib3 before reuse.)
+_session = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=Retry(total=2, connect=2, read=False, status=0, backoff_factor=0.1,
+                      raise_on_status=False)
+)
+_session.mount('http://', _adapter)
+_session.mount('https://', _adapter)
+
+# Upper bounds (seconds) of the upstream call latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30)
+
+# Call latency histograms and error counts per (service, caller) (see get_call_stats)
+_call_stats = {}
+_call_stats_lock = threading.Lock()
+
+# Worker pool for issuing independent upstream calls concurrently (see fan_out)
+_fan_out_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix='fan-out')
+
 def _get_cached_token(service_name):
     """Get cached token if valid, otherwise None."""
     if service_name not in _token_cache:
@@ -45,6 +76,66 @@ def _cache_token(service_name, token):
         'expires_at': expires_at
     }
 
+def response_json(response):
+    """
+    Decode a service response body as JSON.
+
+    Uses orjson on the raw bytes, which is considerably faster than
+    response.json() for large Codex/Beacon/Ledger payloads.
+
+    Args:
+        response: requests.Response returned by call_service
+
+    Returns:
+        Decoded JSON data
+    """
+    return orjson.loads(response.content)
+
+def _bind_context(func):
+    """Wrap func so it runs with the caller's app context, g and request."""
+    app = current_app._get_current_object()
+    g_values = vars(g).copy()
+    if has_request_context():
+        func = copy_current_request_context(func)
+
+    def run():
+        with app.app_context():
+            vars(g).update(g_values)
+            return func()
+    return run
+
+def fan_out(*calls):
+    """
+    Run independent upstream calls concurrently and wait for all of them.
+
+    Each call is a zero-argument callable (e.g. a lambda wrapping call_service
+    or a LedgerClient method). Calls run on a shared thread pool with the
+    current Flask context, so total latency is the slowest call rather than
+    the sum of all of them.
+
+    Args:
+        *calls: Zero-argument callables
+
+    Returns:
+        List of results in the same order as calls. A call that raised has
+        its exception returned in place of a result.
+
+    Example:
+        billing, overrides = fan_out(
+            lambda: ledger.get_billing_for_client(account_number),
+            lambda: ledger.get_client_overrides(account_number),
+        )
+    """
+    futures = [_fan_out_executor.submit(_bind_context(call)) for call in calls]
+
+    results = []
+    for future in futures:
+        try:
+            results.append(future.result())
+        except Exception as e:
+            results.append(e)
+    return results
+
 def call_service(service_name, path, method='GET', **kwargs):
     """
     Makes an authenticated request to another HiveMatrix service.
@@ -54,14 +145,14 @@ def call_service(service_name, path, method='GET', **kwargs):
         service_name: The target service name (e.g., 'codex', 'template')
         path: The path to call (e.g., '/api/data')
         method: HTTP method (default: 'GET')
-        **kwargs: Additional arguments to pass to requests.request()
+        **kwargs: Additional arguments to pass to Session.request()
 
     Returns:
         requests.Response object
 
     Example:
         response = call_service('codex', '/api/companies')
-        companies = response.json()
+        companies = response_json(response)
     """
     # Get the service URL from configuration
     services = current_app.config.get('SERVICES', {})
@@ -78,7 +169,7 @@ def call_service(service_name, path, method='GET', **kwargs):
         core_url = current_app.config.get('CORE_SERVICE_URL')
         calling_service = current_app.config.get('SERVICE_NAME', 'unknown')
 
-        token_response = requests.post(
+        token_response = _session.post(
             f"{core_url}/service-token",
             json={
                 'calling_service': calling_service,
@@ -101,21 +192,97 @@ def call_service(service_name, path, method='GET', **kwargs):
     headers['Authorization'] = f'Bearer {token}'
 
     # Pass correlation ID for distributed tracing
+    if has_request_context() and hasattr(g, 'correlation_id'):
+        headers['X-Correlation-ID'] = g.correlation_id
+
+    # Set default timeout if not specified (prevents hanging requests).
+    # Connect fails fast; reads may take longer for large upstream payloads.
+    kwargs.setdefault('timeout', (5, 30))
+
+    start = time.perf_counter()
     try:
-        from flask import g, has_request_context
-        if has_request_context() and hasattr(g, 'correlation_id'):
-            headers['X-Correlation-ID'] = g.correlation_id
-    except (ImportError, RuntimeError):
-        pass
-
-    # Set default timeout if not specified (prevents hanging requests)
-    kwargs.setdefault('timeout', 30)
-
-    response = requests.request(
-        method=method,
-        url=url,
-        headers=headers,
-        **kwargs
-    )
+        response = _session.request(
+            method=method,
+            url=url,
+            headers=headers,
+            **kwargs
+        )
+    except requests.Timeout:
+        _record_call(service_name, time.perf_counter() - start, 'timeout')
+        raise
+    except requests.ConnectionError:
+        _record_call(service_name, time.perf_counter() - start, 'connection')
+        raise
 
+    error_kind = None
+    if response.status_code >= 500:
+        error_kind = 'http_5xx'
+    elif response.status_code >= 400:
+        error_kind = 'http_4xx'
+    _record_call(service_name, time.perf_counter() - start, error_kind)
     return response
+
+def _caller_label():
+    """Name of the route making the current call, or 'background' outside a request."""
+    if has_request_context():
+        return request.endpoint or 'unknown'
+    return 'background'
+
+def _record_call(service_name, duration, error_kind=None):
+    """Add one upstream call to the latency histogram and error counts for its caller."""
+    key = (service_name, _caller_label())
+    with _call_stats_lock:
+        stats = _call_stats.get(key)
+        if stats is None:
+            stats = _call_stats[key] = {
+                'count': 0,
+                'sum': 0.0,
+                'buckets': [0] * (len(LATENCY_BUCKETS) + 1),
+                'errors': {}
+            }
+        stats['count'] += 1
+        stats['sum'] += duration
+        stats['buckets'][bisect_left(LATENCY_BUCKETS, duration)] += 1
+        if error_kind:
+            stats['errors'][error_kind] = stats['errors'].get(error_kind, 0) + 1
+
+def get_call_stats():
+    """
+    Snapshot of upstream call latency and errors since this process started.
+
+    Covers every call_service() request made in this process: the API routes
+    and the Ledger client. The agent tools run in the Claude session's own
+    process, so their calls are not counted here. Calls are labeled by the
+    route endpoint that made them, or 'background' when made outside a
+    request. Errors are classified as 'timeout', 'connection' (refused or
+    dropped), 'http_4xx' (request rejected) or 'http_5xx' (upstream failure).
+
+    Returns:
+        Dict keyed by service name, then caller:
+        {
+            "ledger": {
+                "ledger_billing_bulk": {
+                    "count": 120,
+                    "sum_seconds": 9.4,
+                    "buckets": {"0.005": 0, "0.01": 2, ..., "+Inf": 120},
+                    "errors": {"timeout": 1}
+                }
+            }
+        }
+        Bucket counts are cumulative (calls that took at most that many seconds).
+    """
+    with _call_stats_lock:
+        snapshot = {}
+        for (service_name, caller), stats in _call_stats.items():
+            buckets = {}
+            total = 0
+            for bound, count in zip(LATENCY_BUCKETS + ('+Inf',), stats['buckets']):
+                total += count
+                buckets[str(bound)] = total
+            snapshot.setdefault(service_name, {})[caller] = {
+                'count': stats['count'],
+                'sum_seconds': round(stats['sum'], 6),
+                'buckets': buckets,
+                'errors': dict(stats['errors'])
+            }
+        return snapshot
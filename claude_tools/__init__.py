@@ -12,8 +12,10 @@ and do NOT directly access external services (Datto RMM, Freshservice, etc.).
 from .codex_tools import (
     get_companies,
     get_company,
+    get_companies_bulk,
     get_tickets,
     get_ticket,
+    get_tickets_bulk,
     update_ticket,
     get_company_contacts,
     get_company_locations,
@@ -37,6 +39,7 @@ __all__ = [
     # Codex tools - Company & PSA data
     'get_companies',
     'get_company',
+    'get_companies_bulk',
     'get_company_contacts',
     'get_company_locations',
     'get_psa_agents',
@@ -44,6 +47,7 @@ __all__ = [
     # Codex tools - Ticket management
     'get_tickets',
     'get_ticket',
+    'get_tickets_bulk',
     'update_ticket',
 
     # Knowledge tools - Documentation & KB
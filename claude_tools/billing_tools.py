@@ -14,9 +14,6 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from app.ledger_client import get_ledger_client
 
-# Initialize client
-ledger = get_ledger_client()
-
 
 def get_billing_for_company(account_number: str, year: int = None, month: int = None) -> dict:
     """
@@ -60,7 +57,7 @@ def get_billing_for_company(account_number: str, year: int = None, month: int =
         >>> print(f"Users: {billing['quantities']['regular_users']}")
     """
     try:
-        return ledger.get_billing_for_client(account_number, year, month)
+        return get_ledger_client().get_billing_for_client(account_number, year, month)
     except Exception as e:
         return {
             'error': 'Failed to retrieve billing information',
@@ -68,6 +65,47 @@ def get_billing_for_company(account_number: str, year: int = None, month: int =
         }
 
 
+def get_billing_for_companies(account_numbers: list, year: int = None, month: int = None) -> dict:
+    """
+    Get complete billing information for several companies at once.
+
+    Much faster than calling get_billing_for_company() in a loop: the Ledger
+    reads are issued concurrently instead of one after another.
+
+    Args:
+        account_numbers: Company account numbers (e.g., ["620547", "620548"])
+        year: Billing year (optional, defaults to current)
+        month: Billing month 1-12 (optional, defaults to current)
+
+    Returns:
+        Dict keyed by account number, each value shaped like
+        get_billing_for_company()'s result. A company whose billing could not
+        be retrieved maps to {"error": ...} instead of failing the whole call.
+        If any account number is not a string or integer, the whole call
+        returns {"error": ...} without querying Ledger.
+
+    Example:
+        >>> billing = get_billing_for_companies(["620547", "620548"])
+        >>> for account, data in billing.items():
+        ...     if 'error' not in data:
+        ...         print(f"{account}: ${data['receipt']['total']:.2f}")
+    """
+    if any(isinstance(account_number, bool) or not isinstance(account_number, (str, int))
+           for account_number in account_numbers):
+        return {'error': 'account_numbers must be strings or integers'}
+
+    # Normalized once up front, so 620547 and "620547" are one account
+    account_numbers = list(dict.fromkeys(str(account_number) for account_number in account_numbers))
+
+    try:
+        return get_ledger_client().get_billing_bulk(account_numbers, year, month)
+    except Exception:
+        return {
+            account_number: {'error': 'Failed to retrieve billing information'}
+            for account_number in account_numbers
+        }
+
+
 def get_all_companies_billing(year: int = None, month: int = None) -> dict:
     """
     Get billing dashboard for all companies.
@@ -100,7 +138,7 @@ def get_all_companies_billing(year: int = None, month: int = None) -> dict:
         ...     print(f"{company['name']}: ${company['total_bill']:.2f}")
     """
     try:
-        return ledger.get_billing_dashboard(year, month)
+        return get_ledger_client().get_billing_dashboard(year, month)
     except Exception as e:
         return {
             'error': 'Failed to retrieve billing dashboard',
@@ -133,7 +171,7 @@ def get_billing_plans() -> list:
         ...     print(f"{plan['billing_plan']} - {plan['term_length']}")
     """
     try:
-        return ledger.get_billing_plans()
+        return get_ledger_client().get_billing_plans()
     except Exception as e:
         return []
 
@@ -162,7 +200,7 @@ def get_company_overrides(account_number: str) -> dict:
         ...     print("Company has custom pricing")
     """
     try:
-        return ledger.get_client_overrides(account_number)
+        return get_ledger_client().get_client_overrides(account_number)
     except Exception as e:
         return {
             'error': 'Failed to retrieve billing overrides',
@@ -203,7 +241,7 @@ def set_billing_override(account_number: str, **overrides) -> dict:
         >>> print(result['message'])
     """
     try:
-        return ledger.set_client_override(account_number, overrides)
+        return get_ledger_client().set_client_override(account_number, overrides)
     except Exception as e:
         return {
             'error': 'Failed to set billing overrides',
@@ -244,7 +282,8 @@ def add_manual_asset(
         >>> print(f"Added asset ID: {result['id']}")
     """
     try:
-        return ledger.add_manual_asset(account_number, hostname, billing_type, custom_cost, notes)
+        return get_ledger_client().add_manual_asset(account_number, hostname, billing_type,
+                                                    custom_cost, notes)
     except Exception as e:
         return {
             'error': 'Failed to add manual asset',
@@ -285,7 +324,8 @@ def add_manual_user(
         >>> print(f"Added user ID: {result['id']}")
     """
     try:
-        return ledger.add_manual_user(account_number, full_name, billing_type, custom_cost, notes)
+        return get_ledger_client().add_manual_user(account_number, full_name, billing_type,
+                                                   custom_cost, notes)
     except Exception as e:
         return {
             'error': 'Failed to add manual user',
@@ -359,7 +399,7 @@ def add_line_item(
         # Remove None values
         kwargs = {k: v for k, v in kwargs.items() if v is not None}
 
-        return ledger.add_custom_line_item(account_number, **kwargs)
+        return get_ledger_client().add_custom_line_item(account_number, **kwargs)
     except Exception as e:
         return {
             'error': 'Failed to add line item',
@@ -393,7 +433,7 @@ def get_invoice_summary(account_number: str, year: int, month: int) -> dict:
         ...     print("Already finalized")
     """
     try:
-        return ledger.get_invoice_summary(account_number, year, month)
+        return get_ledger_client().get_invoice_summary(account_number, year, month)
     except Exception as e:
         return {
             'error': 'Failed to retrieve invoice summary',
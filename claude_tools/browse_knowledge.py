@@ -12,8 +12,8 @@ Example:
 
 import sys
 import os
-import json
 import argparse
+import orjson
 
 # Add parent directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
@@ -33,7 +33,7 @@ def main():
         result = browse_knowledge(args.path)
 
         if args.json:
-            print(json.dumps(result, indent=2))
+            sys.stdout.buffer.write(orjson.dumps(result, option=orjson.OPT_INDENT_2) + b"\n")
         else:
             # Pretty print
             if 'error' in result:
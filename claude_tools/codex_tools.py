@@ -11,7 +11,7 @@ import json
 # Add parent directory to path to import service_client
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from app.service_client import call_service
+from app.service_client import call_service, fan_out, response_json
 
 
 def get_companies(limit: int = 100) -> dict:
@@ -35,8 +35,8 @@ def get_companies(limit: int = 100) -> dict:
         >>> print(f"Found {companies['count']} companies")
     """
     try:
-        response = call_service('codex', f'/api/companies?limit={limit}')
-        return response.json()
+        response = call_service('codex', '/api/companies', params={'limit': limit})
+        return response_json(response)
     except Exception as e:
         return {
             'error': 'Failed to retrieve companies',
@@ -68,7 +68,7 @@ def get_company(company_id: int) -> dict:
     """
     try:
         response = call_service('codex', f'/api/company/{company_id}')
-        return response.json()
+        return response_json(response)
     except Exception as e:
         return {
             'error': 'Failed to retrieve company details',
@@ -76,6 +76,41 @@ def get_company(company_id: int) -> dict:
         }
 
 
+def get_companies_bulk(company_ids: list) -> list:
+    """
+    Get detailed information about several companies at once.
+
+    Much faster than calling get_company() in a loop: the Codex requests are
+    issued concurrently instead of one after another.
+
+    Args:
+        company_ids: Company IDs
+
+    Returns:
+        List of get_company() results in the same order as company_ids. A
+        company that could not be retrieved has an {"error": ..., "id": ...}
+        entry instead of failing the whole call.
+
+    Example:
+        >>> for company in get_companies_bulk([1, 2, 3]):
+        ...     print(company.get('name', company.get('error')))
+    """
+    try:
+        results = fan_out(*[
+            lambda company_id=company_id: get_company(company_id)
+            for company_id in company_ids
+        ])
+    except Exception as e:
+        # e.g. no app context to run the calls in: report every item as failed
+        results = [e] * len(company_ids)
+
+    return [
+        result if not isinstance(result, Exception)
+        else {'error': 'Failed to retrieve company details', 'id': company_id}
+        for company_id, result in zip(company_ids, results)
+    ]
+
+
 def get_tickets(
     company_id: int = None,
     status: str = None,
@@ -116,10 +151,9 @@ def get_tickets(
         if status:
             params['status'] = status
 
-        query_string = '&'.join(f'{k}={v}' for k, v in params.items())
-        response = call_service('codex', f'/api/tickets?{query_string}')
+        response = call_service('codex', '/api/tickets', params=params)
 
-        return response.json()
+        return response_json(response)
     except Exception as e:
         return {
             'error': 'Failed to retrieve tickets',
@@ -159,7 +193,7 @@ def get_ticket(ticket_id: int) -> dict:
     """
     try:
         response = call_service('codex', f'/api/ticket/{ticket_id}')
-        return response.json()
+        return response_json(response)
     except Exception as e:
         return {
             'error': 'Failed to retrieve ticket details',
@@ -167,6 +201,41 @@ def get_ticket(ticket_id: int) -> dict:
         }
 
 
+def get_tickets_bulk(ticket_ids: list) -> list:
+    """
+    Get detailed information about several tickets at once.
+
+    Much faster than calling get_ticket() in a loop (e.g., to enrich a list
+    returned by get_tickets()): the Codex requests are issued concurrently.
+
+    Args:
+        ticket_ids: Ticket IDs
+
+    Returns:
+        List of get_ticket() results in the same order as ticket_ids. A ticket
+        that could not be retrieved has an {"error": ..., "id": ...} entry
+        instead of failing the whole call.
+
+    Example:
+        >>> tickets = get_tickets(status='open', limit=10)
+        >>> details = get_tickets_bulk([t['id'] for t in tickets['tickets']])
+    """
+    try:
+        results = fan_out(*[
+            lambda ticket_id=ticket_id: get_ticket(ticket_id)
+            for ticket_id in ticket_ids
+        ])
+    except Exception as e:
+        # e.g. no app context to run the calls in: report every item as failed
+        results = [e] * len(ticket_ids)
+
+    return [
+        result if not isinstance(result, Exception)
+        else {'error': 'Failed to retrieve ticket details', 'id': ticket_id}
+        for ticket_id, result in zip(ticket_ids, results)
+    ]
+
+
 def update_ticket(
     ticket_id: int,
     status: str = None,
@@ -213,7 +282,7 @@ def update_ticket(
             json=data
         )
 
-        return response.json()
+        return response_json(response)
     except Exception as e:
         return {
             'success': False,
@@ -252,7 +321,7 @@ def get_company_contacts(company_account_number: str) -> list:
     """
     try:
         response = call_service('codex', f'/api/companies/{company_account_number}/contacts')
-        return response.json()
+        return response_json(response)
     except Exception as e:
         return {
             'error': f'Failed to retrieve company contacts: {str(e)}',
@@ -285,7 +354,7 @@ def get_company_locations(company_account_number: str) -> list:
     """
     try:
         response = call_service('codex', f'/api/companies/{company_account_number}/locations')
-        return response.json()
+        return response_json(response)
     except Exception as e:
         return {
             'error': f'Failed to retrieve company locations: {str(e)}',
@@ -327,11 +396,8 @@ def get_psa_agents(provider: str = None) -> list:
         if provider:
             params['provider'] = provider
 
-        query_string = '&'.join(f'{k}={v}' for k, v in params.items()) if params else ''
-        url = f'/api/psa/agents?{query_string}' if query_string else '/api/psa/agents'
-
-        response = call_service('codex', url)
-        return response.json()
+        response = call_service('codex', '/api/psa/agents', params=params)
+        return response_json(response)
     except Exception as e:
         return {
             'error': f'Failed to retrieve PSA agents: {str(e)}',
@@ -12,7 +12,7 @@ import json
 # Add parent directory to path to import service_client
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from app.service_client import call_service
+from app.service_client import call_service, response_json
 
 
 def get_devices(company_account_number: str = None, status: str = None) -> dict:
@@ -56,11 +56,8 @@ def get_devices(company_account_number: str = None, status: str = None) -> dict:
         if status:
             params['status'] = status
 
-        query_string = '&'.join(f'{k}={v}' for k, v in params.items()) if params else ''
-        url = f'/api/rmm/devices?{query_string}' if query_string else '/api/rmm/devices'
-
-        response = call_service('codex', url)
-        return response.json()
+        response = call_service('codex', '/api/rmm/devices', params=params)
+        return response_json(response)
     except Exception as e:
         return {
             'error': f'Failed to retrieve devices: {str(e)}',
@@ -114,7 +111,7 @@ def get_device(device_id: str) -> dict:
     """
     try:
         response = call_service('codex', f'/api/rmm/device/{device_id}')
-        return response.json()
+        return response_json(response)
     except Exception as e:
         return {
             'error': f'Failed to retrieve device details: {str(e)}',
@@ -159,7 +156,7 @@ def get_company_assets(company_account_number: str) -> dict:
     """
     try:
         response = call_service('codex', f'/api/companies/{company_account_number}/assets')
-        return response.json()
+        return response_json(response)
     except Exception as e:
         return {
             'error': f'Failed to retrieve company assets: {str(e)}',
@@ -16,7 +16,7 @@ load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.flaskenv'))
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from app import app
-from app.service_client import call_service
+from app.service_client import call_service, response_json
 from app.presidio_filter import filter_by_compliance_level
 import json
 
@@ -25,7 +25,7 @@ def get_ticket(ticket_id):
     with app.app_context():
         try:
             response = call_service('codex', f'/api/ticket/{ticket_id}')
-            ticket = response.json()
+            ticket = response_json(response)
 
             if 'error' in ticket:
                 print(f"Error: {ticket['error']}")
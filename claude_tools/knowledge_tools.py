@@ -10,7 +10,7 @@ import sys
 # Add parent directory to path to import service_client
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from app.service_client import call_service
+from app.service_client import call_service, response_json
 
 
 def search_knowledge(query: str, limit: int = 10) -> dict:
@@ -44,9 +44,10 @@ def search_knowledge(query: str, limit: int = 10) -> dict:
     try:
         response = call_service(
             'knowledgetree',
-            f'/api/search?query={query}&limit={limit}'
+            '/api/search',
+            params={'query': query, 'limit': limit}
         )
-        return response.json()
+        return response_json(response)
     except Exception as e:
         return {
             'error': 'Failed to search knowledge base',
@@ -84,8 +85,8 @@ def browse_knowledge(path: str = '/') -> dict:
         >>> print(f"Categories: {[c['name'] for c in kb['categories']]}")
     """
     try:
-        response = call_service('knowledgetree', f'/api/browse?path={path}')
-        return response.json()
+        response = call_service('knowledgetree', '/api/browse', params={'path': path})
+        return response_json(response)
     except Exception as e:
         return {
             'error': 'Failed to browse knowledge base',
@@ -124,7 +125,7 @@ def get_article(article_id: str) -> dict:
     """
     try:
         response = call_service('knowledgetree', f'/api/node/{article_id}')
-        return response.json()
+        return response_json(response)
     except Exception as e:
         return {
             'error': 'Failed to retrieve article',
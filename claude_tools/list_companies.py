@@ -17,15 +17,15 @@ load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.flaskenv'))
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from app import app
-from app.service_client import call_service
+from app.service_client import call_service, response_json
 from app.presidio_filter import filter_by_compliance_level
 
 def list_companies(limit=20):
     """List companies."""
     with app.app_context():
         try:
-            response = call_service('codex', f'/api/companies?limit={limit}')
-            companies = response.json()
+            response = call_service('codex', '/api/companies', params={'limit': limit})
+            companies = response_json(response)
 
             if isinstance(companies, dict) and 'error' in companies:
                 print(f"Error: {companies['error']}")
@@ -17,7 +17,7 @@ load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.flaskenv'))
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from app import app
-from app.service_client import call_service
+from app.service_client import call_service, response_json
 from app.presidio_filter import filter_by_compliance_level
 
 def list_tickets(status=None, company_id=None, limit=10):
@@ -30,9 +30,8 @@ def list_tickets(status=None, company_id=None, limit=10):
             if company_id:
                 params['company_id'] = company_id
 
-            query_string = '&'.join(f'{k}={v}' for k, v in params.items())
-            response = call_service('codex', f'/api/tickets?{query_string}')
-            data = response.json()
+            response = call_service('codex', '/api/tickets', params=params)
+            data = response_json(response)
 
             if 'error' in data:
                 print(f"Error: {data['error']}")
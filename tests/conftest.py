@@ -0,0 +1,11 @@
+"""
+Shared pytest setup.
+
+Importing the app package reads its configuration from the environment, so
+give the required settings harmless defaults before any test imports it.
+"""
+
+import os
+
+os.environ.setdefault('CORE_SERVICE_URL', 'http://localhost:5000')
+os.environ.setdefault('ENABLE_JSON_LOGGING', 'false')
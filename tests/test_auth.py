@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Test JWT verification caching in decode_token.
+
+Signature checks are replaced with a recorder, so this test validates that:
+- Repeat requests with the same token reuse the verified claims
+- Cached claims never outlive the token's 'exp' or VERIFIED_TOKEN_TTL
+- Tokens without an 'exp' claim are never cached
+"""
+
+import pytest
+
+pytest.importorskip('presidio_analyzer')
+pytest.importorskip('flask_compress')
+
+from types import SimpleNamespace
+
+import jwt
+
+from app import auth, response_cache
+
+
+class FakeClock:
+    """Stand-in for time.time and time.monotonic that only moves when advanced."""
+
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Freeze the clocks used for token expiry and cache expiry."""
+    clock = FakeClock()
+    monkeypatch.setattr(auth.time, 'time', clock)
+    monkeypatch.setattr(response_cache.time, 'monotonic', clock)
+    return clock
+
+
+@pytest.fixture
+def verify(monkeypatch, clock):
+    """Replace JWKS lookup and signature checks with a recorder of verified tokens."""
+    verified = []
+    claims = {}
+
+    class FakeJWKSClient:
+        def get_signing_key_from_jwt(self, token):
+            return type('SigningKey', (), {'key': 'public-key'})()
+
+    def decode(token, key, **kwargs):
+        verified.append(token)
+        data = claims[token]
+        if 'exp' in data and data['exp'] <= clock.now:
+            raise jwt.ExpiredSignatureError('Signature has expired')
+        return dict(data)
+
+    monkeypatch.setattr(auth, 'jwks_client', FakeJWKSClient())
+    monkeypatch.setattr(auth.jwt, 'decode', decode)
+    auth._verified_tokens.clear()
+    yield SimpleNamespace(verified=verified, claims=claims)
+    auth._verified_tokens.clear()
+
+
+def test_repeat_token_uses_cache(verify, clock):
+    """Test that the signature is checked once for repeat requests."""
+    verify.claims['t1'] = {'sub': 'user', 'exp': clock.now + 3600}
+
+    first = auth.decode_token('t1')
+    first['sub'] = 'modified'
+    second = auth.decode_token('t1')
+
+    assert second['sub'] == 'user'
+    assert verify.verified == ['t1']
+
+
+def test_cache_capped_by_verified_token_ttl(verify, clock):
+    """Test that long-lived tokens are re-verified after VERIFIED_TOKEN_TTL."""
+    verify.claims['t1'] = {'sub': 'user', 'exp': clock.now + 3600}
+
+    auth.decode_token('t1')
+    clock.advance(auth.VERIFIED_TOKEN_TTL + 1)
+    auth.decode_token('t1')
+
+    assert verify.verified == ['t1', 't1']
+
+
+def test_cache_never_outlives_exp(verify, clock):
+    """Test that a token expiring before the cache TTL is rejected once expired."""
+    verify.claims['t1'] = {'sub': 'user', 'exp': clock.now + 10}
+
+    auth.decode_token('t1')
+    clock.advance(9)
+    auth.decode_token('t1')
+    assert verify.verified == ['t1']
+
+    clock.advance(1)
+    with pytest.raises(jwt.ExpiredSignatureError):
+        auth.decode_token('t1')
+
+
+def test_tokens_without_exp_not_cached(verify, clock):
+    """Test that tokens with no 'exp' claim are verified on every request."""
+    verify.claims['t2'] = {'sub': 'service'}
+
+    assert auth.decode_token('t2') == {'sub': 'service'}
+    assert auth.decode_token('t2') == {'sub': 'service'}
+
+    assert verify.verified == ['t2', 't2']
+    assert len(auth._verified_tokens) == 0
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Test the bulk billing endpoint and the bulk agent tools.
+
+Upstream services are replaced with fakes, so this test validates that:
+- POST /api/ledger/billing/bulk validates its body and enforces MAX_BULK_ACCOUNTS
+- Account numbers are type-checked and deduped after normalizing to strings
+- A failing account is reported under 'errors' without failing the others
+- get_billing_for_companies, get_tickets_bulk and get_companies_bulk keep
+  per-item failures in place and preserve order
+"""
+
+import os
+import sys
+
+import pytest
+
+pytest.importorskip('presidio_analyzer')
+pytest.importorskip('flask_compress')
+
+import orjson
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app import auth, limiter, routes
+from app import ledger_client as ledger_module
+from claude_tools import billing_tools, codex_tools
+
+
+class FakeResponse:
+    """Minimal requests.Response returned by the fake call_service."""
+
+    def __init__(self, status_code, data):
+        self.status_code = status_code
+        self.content = orjson.dumps(data)
+        self.text = self.content.decode('utf-8')
+
+
+def fake_ledger(service, endpoint, **kwargs):
+    """Ledger stand-in: account '500' returns HTTP 500, account 'down' is unreachable."""
+    account_number = endpoint.rsplit('/', 1)[-1]
+    if account_number == 'down':
+        raise requests.ConnectionError('connection refused')
+    if account_number == '500':
+        return FakeResponse(500, {'error': 'boom'})
+    return FakeResponse(200, {'account_number': account_number, 'receipt': {'total': 100.0}})
+
+
+@pytest.fixture
+def ledger(monkeypatch):
+    """A fresh LedgerClient (empty read cache) backed by fake_ledger."""
+    client = ledger_module.LedgerClient()
+    monkeypatch.setattr(ledger_module, 'call_service', fake_ledger)
+    monkeypatch.setattr(ledger_module, 'get_ledger_client', lambda: client)
+    monkeypatch.setattr(routes, 'get_ledger_client', lambda: client)
+    monkeypatch.setattr(billing_tools, 'get_ledger_client', lambda: client)
+    return client
+
+
+@pytest.fixture
+def client(monkeypatch, ledger):
+    """Test client with auth and rate limits bypassed and filtering passed through."""
+    monkeypatch.setattr(auth, 'jwks_client', object())
+    monkeypatch.setattr(auth, 'decode_token', lambda token: {'sub': 'tester'})
+    monkeypatch.setattr(limiter, 'enabled', False)
+    monkeypatch.setattr(routes, 'apply_company_filtering', lambda data, *args, **kwargs: data)
+    return routes.app.test_client()
+
+
+def post_bulk(client, **kwargs):
+    """POST to the bulk billing endpoint with a bearer token."""
+    return client.post('/api/ledger/billing/bulk',
+                       headers={'Authorization': 'Bearer token'}, **kwargs)
+
+
+@pytest.mark.parametrize('kwargs', [
+    {},
+    {'data': 'not json', 'content_type': 'application/json'},
+    {'json': ['620547']},
+    {'json': {}},
+    {'json': {'year': 2025}},
+    {'json': {'account_numbers': '620547'}},
+    {'json': {'account_numbers': []}},
+])
+def test_invalid_body_rejected(client, kwargs):
+    """Test that missing, malformed or empty request bodies get a 400."""
+    response = post_bulk(client, **kwargs)
+
+    assert response.status_code == 400
+    assert response.get_json() == {'error': 'account_numbers required'}
+
+
+@pytest.mark.parametrize('account_numbers', [
+    [[1], {'a': 1}],
+    ['620547', None],
+    ['620547', 1.5],
+    [True],
+])
+def test_invalid_account_numbers_rejected(client, account_numbers):
+    """Test that account numbers other than strings or integers get a 400, not a 500."""
+    response = post_bulk(client, json={'account_numbers': account_numbers})
+
+    assert response.status_code == 400
+    assert response.get_json() == {'error': 'account_numbers must be strings or integers'}
+
+
+def test_account_numbers_deduped_after_str(client, monkeypatch):
+    """Test that 1 and "1" are one account and Ledger is called once for it."""
+    calls = []
+
+    def counting_ledger(service, endpoint, **kwargs):
+        calls.append(endpoint)
+        return fake_ledger(service, endpoint, **kwargs)
+
+    monkeypatch.setattr(ledger_module, 'call_service', counting_ledger)
+
+    response = post_bulk(client, json={'account_numbers': [1, '1', 2, '2', 1]})
+
+    assert response.status_code == 200
+    assert list(response.get_json()['data']) == ['1', '2']
+    assert sorted(calls) == ['/api/billing/1', '/api/billing/2']
+
+
+def test_max_bulk_accounts(client):
+    """Test that MAX_BULK_ACCOUNTS accounts are accepted and one more is rejected."""
+    accounts = [str(600000 + i) for i in range(routes.MAX_BULK_ACCOUNTS)]
+
+    response = post_bulk(client, json={'account_numbers': accounts})
+    assert response.status_code == 200
+    assert len(response.get_json()['data']) == routes.MAX_BULK_ACCOUNTS
+
+    response = post_bulk(client, json={'account_numbers': accounts + ['699999']})
+    assert response.status_code == 400
+    assert response.get_json() == {
+        'error': f'At most {routes.MAX_BULK_ACCOUNTS} account_numbers per request'
+    }
+
+
+def test_account_failures_reported_separately(client, ledger, monkeypatch):
+    """Test that failing accounts land in 'errors' and the rest still return data."""
+    original = ledger.get_billing_for_client
+
+    def get_billing_for_client(account_number, year=None, month=None):
+        if account_number == 'raises':
+            raise RuntimeError('unexpected')
+        return original(account_number, year, month)
+
+    monkeypatch.setattr(ledger, 'get_billing_for_client', get_billing_for_client)
+
+    response = post_bulk(client, json={
+        'account_numbers': [620547, '620548', '500', 'down', 'raises', '620547']
+    })
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert set(body['data']) == {'620547', '620548'}
+    assert body['data']['620548']['receipt'] == {'total': 100.0}
+    assert body['errors'] == {
+        '500': 'Ledger returned 500',
+        'down': 'Internal server error',
+        'raises': 'Internal server error',
+    }
+
+
+def test_get_billing_for_companies(ledger):
+    """Test that the tool dedupes accounts and keeps per-account errors in place."""
+    with routes.app.app_context():
+        billing = billing_tools.get_billing_for_companies(['620547', '500', '620547', 'down'])
+
+    assert list(billing) == ['620547', '500', 'down']
+    assert billing['620547']['account_number'] == '620547'
+    assert billing['500']['error'] == 'Ledger returned 500'
+    assert billing['down'] == {'error': 'Internal server error'}
+
+
+def test_get_billing_for_companies_client_failure(monkeypatch):
+    """Test that every account gets an error if the Ledger client can't be used."""
+    def broken_client():
+        raise RuntimeError('no config')
+
+    monkeypatch.setattr(billing_tools, 'get_ledger_client', broken_client)
+
+    assert billing_tools.get_billing_for_companies(['620547', '620548']) == {
+        '620547': {'error': 'Failed to retrieve billing information'},
+        '620548': {'error': 'Failed to retrieve billing information'},
+    }
+
+
+def test_get_billing_for_companies_normalizes_ids(ledger, monkeypatch):
+    """Test that integer and string forms of an account are queried once."""
+    calls = []
+
+    def counting_ledger(service, endpoint, **kwargs):
+        calls.append(endpoint)
+        return fake_ledger(service, endpoint, **kwargs)
+
+    monkeypatch.setattr(ledger_module, 'call_service', counting_ledger)
+
+    with routes.app.app_context():
+        billing = billing_tools.get_billing_for_companies([620547, '620547', 620548])
+
+    assert list(billing) == ['620547', '620548']
+    assert sorted(calls) == ['/api/billing/620547', '/api/billing/620548']
+
+
+@pytest.mark.parametrize('account_numbers', [[[1], {'a': 1}], ['620547', None], [True]])
+def test_get_billing_for_companies_invalid_ids(monkeypatch, account_numbers):
+    """Test that invalid account numbers return an error without calling Ledger."""
+    def broken_client():
+        raise AssertionError('Ledger should not be called')
+
+    monkeypatch.setattr(billing_tools, 'get_ledger_client', broken_client)
+
+    assert billing_tools.get_billing_for_companies(account_numbers) == {
+        'error': 'account_numbers must be strings or integers'
+    }
+
+
+def fake_codex(service, endpoint, **kwargs):
+    """Codex stand-in: item 13 is unreachable, everything else returns its id."""
+    item_id = int(endpoint.rsplit('/', 1)[-1])
+    if item_id == 13:
+        raise requests.Timeout('read timed out')
+    return FakeResponse(200, {'id': item_id, 'endpoint': endpoint})
+
+
+def test_get_tickets_bulk_partial_failure(monkeypatch):
+    """Test that a failed ticket gets an error entry in its place."""
+    monkeypatch.setattr(codex_tools, 'call_service', fake_codex)
+
+    with routes.app.app_context():
+        tickets = codex_tools.get_tickets_bulk([5, 13, 8])
+
+    assert tickets == [
+        {'id': 5, 'endpoint': '/api/ticket/5'},
+        {'error': 'Failed to retrieve ticket details', 'id': 13},
+        {'id': 8, 'endpoint': '/api/ticket/8'},
+    ]
+
+
+def test_get_companies_bulk_partial_failure(monkeypatch):
+    """Test that a failed company gets an error entry in its place."""
+    monkeypatch.setattr(codex_tools, 'call_service', fake_codex)
+
+    with routes.app.app_context():
+        companies = codex_tools.get_companies_bulk([13, 2])
+
+    assert companies == [
+        {'error': 'Failed to retrieve company details', 'id': 13},
+        {'id': 2, 'endpoint': '/api/company/2'},
+    ]
+
+
+def test_bulk_tools_map_raised_exceptions(monkeypatch):
+    """Test that an item whose call raised gets an error entry instead of the exception."""
+    def get_ticket(ticket_id):
+        if ticket_id == 13:
+            raise RuntimeError('unexpected')
+        return {'id': ticket_id}
+
+    monkeypatch.setattr(codex_tools, 'get_ticket', get_ticket)
+    monkeypatch.setattr(codex_tools, 'get_company', get_ticket)
+
+    with routes.app.app_context():
+        tickets = codex_tools.get_tickets_bulk([13, 2])
+        companies = codex_tools.get_companies_bulk([2, 13])
+
+    assert tickets == [{'error': 'Failed to retrieve ticket details', 'id': 13}, {'id': 2}]
+    assert companies == [{'id': 2}, {'error': 'Failed to retrieve company details', 'id': 13}]
+
+
+def test_bulk_tools_outside_app_context():
+    """Test that the bulk tools return error entries instead of raising without an app context."""
+    assert codex_tools.get_tickets_bulk([5, 8]) == [
+        {'error': 'Failed to retrieve ticket details', 'id': 5},
+        {'error': 'Failed to retrieve ticket details', 'id': 8},
+    ]
+    assert codex_tools.get_companies_bulk([2]) == [
+        {'error': 'Failed to retrieve company details', 'id': 2},
+    ]
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Test compliance-level filtering of upstream payloads (apply_company_filtering).
+
+Presidio itself is replaced with a recorder, so these tests cover:
+- Filtered results cached by payload content
+- Cached results returned as independent copies
+- List items grouped into one Presidio batch per compliance level
+- A broken or stalled worker pool falls back to in-process filtering
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturesTimeoutError
+
+import pytest
+
+pytest.importorskip('presidio_analyzer')
+pytest.importorskip('flask_compress')
+
+
+@pytest.fixture
+def routes(monkeypatch):
+    """app.routes with Presidio workers disabled and an empty filter cache."""
+    from app import routes
+
+    monkeypatch.setitem(routes.app.config, 'PRESIDIO_WORKERS', 0)
+    routes._filter_cache.clear()
+    yield routes
+    routes._filter_cache.clear()
+
+
+@pytest.fixture
+def calls(routes, monkeypatch):
+    """Replace Presidio with a recorder and return the list of calls it receives."""
+    calls = []
+
+    def fake_filter(data, compliance_level, cache=None):
+        calls.append((compliance_level, data))
+        if isinstance(data, list):
+            return [dict(item, name=f"<{compliance_level}>") for item in data]
+        return dict(data, name=f"<{compliance_level}>")
+
+    monkeypatch.setattr(routes, 'filter_by_compliance_level', fake_filter)
+    return calls
+
+
+def test_cache_miss_then_hit(routes, calls):
+    """Test that an identical payload is filtered once and then served from cache."""
+    company = {'name': 'Acme Corp', 'compliance_level': 'hipaa'}
+
+    first = routes.apply_company_filtering(company)
+    second = routes.apply_company_filtering(dict(company))
+
+    assert first == second == {'name': '<hipaa>', 'compliance_level': 'hipaa'}
+    assert len(calls) == 1
+
+
+def test_changed_payload_is_cache_miss(routes, calls):
+    """Test that a changed payload is filtered again."""
+    routes.apply_company_filtering({'name': 'Acme Corp'})
+    routes.apply_company_filtering({'name': 'Other Corp'})
+    routes.apply_company_filtering({'name': 'Other Corp'})
+
+    assert len(calls) == 2
+
+
+def test_cached_results_are_copies(routes, calls):
+    """Test that modifying a returned result doesn't change later cache hits."""
+    tickets = [{'id': 1, 'name': 'Jane', 'company_compliance_level': 'cjis'}]
+
+    first = routes.apply_company_filtering(tickets)
+    first[0]['name'] = 'modified'
+    first.append({'id': 2})
+    second = routes.apply_company_filtering(tickets)
+
+    assert second == [{'id': 1, 'name': '<cjis>', 'company_compliance_level': 'cjis'}]
+    assert len(calls) == 1
+
+
+def test_list_grouped_by_compliance_level(routes, calls):
+    """Test that list items are batched per level and returned in their original order."""
+    items = [
+        {'id': 1, 'company_compliance_level': 'hipaa'},
+        {'id': 2, 'company_compliance_level': 'standard'},
+        'not a dict',
+        {'id': 3, 'compliance_level': 'hipaa'},
+        {'id': 4},
+    ]
+
+    filtered = routes.apply_company_filtering(items)
+
+    batches = {level: [item['id'] for item in batch] for level, batch in calls}
+    assert batches == {'hipaa': [1, 3], 'standard': [2, 4]}
+    assert [item if isinstance(item, str) else (item['id'], item['name']) for item in filtered] == [
+        (1, '<hipaa>'), (2, '<standard>'), 'not a dict', (3, '<hipaa>'), (4, '<standard>')
+    ]
+
+
+def test_primitives_pass_through(routes, calls):
+    """Test that non-container payloads are returned unfiltered."""
+    assert routes.apply_company_filtering('text') == 'text'
+    assert routes.apply_company_filtering(None) is None
+    assert calls == []
+
+
+def test_broken_pool_falls_back_and_resets(routes, calls, monkeypatch):
+    """Test that a pool with a dead worker is dropped and the payload filtered in-process."""
+    pool = ProcessPoolExecutor(max_workers=1)
+    with pytest.raises(Exception):
+        # Kill the worker, as an OOM during the spaCy load would
+        pool.submit(os._exit, 1).result()
+
+    monkeypatch.setitem(routes.app.config, 'PRESIDIO_WORKERS', 1)
+    monkeypatch.setattr(routes, '_presidio_pool', pool)
+
+    filtered = routes.apply_company_filtering({'name': 'Acme Corp', 'compliance_level': 'cjis'})
+
+    assert filtered == {'name': '<cjis>', 'compliance_level': 'cjis'}
+    assert len(calls) == 1
+    assert routes._presidio_pool is None
+
+
+def test_stalled_pool_times_out(routes, calls, monkeypatch):
+    """Test that a stalled worker is cancelled and the payload filtered in-process."""
+    class StalledFuture:
+        cancelled = False
+
+        def result(self, timeout=None):
+            assert timeout == routes.PRESIDIO_POOL_TIMEOUT
+            raise FuturesTimeoutError()
+
+        def cancel(self):
+            StalledFuture.cancelled = True
+
+    class StalledPool:
+        def submit(self, fn, *args):
+            return StalledFuture()
+
+    pool = StalledPool()
+    monkeypatch.setitem(routes.app.config, 'PRESIDIO_WORKERS', 1)
+    monkeypatch.setattr(routes, '_presidio_pool', pool)
+
+    filtered = routes.apply_company_filtering({'name': 'Acme Corp'})
+
+    assert filtered == {'name': '<standard>'}
+    assert StalledFuture.cancelled
+    assert routes._presidio_pool is pool
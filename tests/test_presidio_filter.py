@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Test PresidioFilter against a plain per-string reference.
+
+The filter walks payloads iteratively, skips strings that can't contain the
+requested entities, batches the analyzer calls and reuses results for repeated
+strings. These tests check that none of that changes the output:
+- Nested dict/list/tuple payloads filter the same as the recursive walk
+- Strings skipped by the prefilter contain no entities
+- The regex-only path finds the same entities as the analyzer and redacts
+  overlapping matches, though possibly under a different label
+- Repeated strings are anonymized the same way, with or without a cache
+"""
+
+import pytest
+
+pytest.importorskip('presidio_analyzer')
+pytest.importorskip('flask_compress')
+spacy = pytest.importorskip('spacy')
+
+if not spacy.util.is_package('en_core_web_lg'):
+    pytest.skip("Presidio's en_core_web_lg spaCy model is not installed",
+                allow_module_level=True)
+
+from app.presidio_filter import PresidioFilter
+
+
+SAMPLE_TEXTS = [
+    "Card on file is 4111 1111 1111 1111, please update it",
+    "Employee SSN 536-22-8726 was entered in the wrong field",
+    "Wire to IBAN GB82 WEST 1234 5698 7654 32 failed",
+    "Passport 912803456 scanned into the shared drive",
+    "Contact Jane Doe at jane.doe@example.com or (206) 555-0143",
+    "Workstation 192.168.10.24 can't reach the file server",
+    "Printer offline in reception",
+    "Ticket #48213 reopened after 3 days",
+    "Met John Smith in Seattle about the rollout",
+    "",
+]
+
+
+@pytest.fixture(scope='module')
+def presidio():
+    """One PresidioFilter for the module (loading the NLP model is slow)."""
+    return PresidioFilter()
+
+
+def entity_lists(presidio):
+    """The entity lists used by the standard, hipaa and cjis compliance levels."""
+    return [presidio.critical_entities, presidio.hipaa_entities, presidio.cjis_entities]
+
+
+def reference_filter(presidio, data, entity_types, fields_to_filter=None):
+    """Recursively filter data with one analyzer and anonymizer call per string."""
+    operators = presidio._get_operators(entity_types, "replace")
+
+    def anonymize(text):
+        results = presidio.analyzer.analyze(text=text, language='en', entities=entity_types)
+        return presidio.anonymizer.anonymize(text=text, analyzer_results=results,
+                                             operators=operators).text
+
+    def walk(value):
+        if isinstance(value, str):
+            return anonymize(value)
+        if isinstance(value, dict):
+            return {
+                key: walk(item) if not fields_to_filter or key in fields_to_filter else item
+                for key, item in value.items()
+            }
+        if isinstance(value, list):
+            return [walk(item) for item in value]
+        return value
+
+    return walk(data)
+
+
+def sample_payload():
+    """A ticket list with nested dicts, lists, tuples and non-string scalars."""
+    return [
+        {
+            'id': 1,
+            'subject': SAMPLE_TEXTS[0],
+            'description': SAMPLE_TEXTS[4],
+            'company': {'name': 'Acme Corp', 'notes': [SAMPLE_TEXTS[1], 42, None]},
+            'comments': [
+                {'author': 'Jane Doe', 'body': SAMPLE_TEXTS[5], 'tags': ('vpn', SAMPLE_TEXTS[0])},
+                {'author': 'John Smith', 'body': SAMPLE_TEXTS[8], 'attachments': []},
+            ],
+            'closed': False,
+        },
+        {'id': 2, 'subject': SAMPLE_TEXTS[6], 'description': SAMPLE_TEXTS[2], 'hours': 1.5},
+        SAMPLE_TEXTS[3],
+        7,
+    ]
+
+
+def test_nested_payload_matches_reference(presidio):
+    """Test that nested payloads filter the same as the recursive per-string walk."""
+    payload = sample_payload()
+
+    for entity_types in entity_lists(presidio):
+        expected = reference_filter(presidio, payload, entity_types)
+        assert presidio.filter_list(payload, entity_types=entity_types) == expected
+        assert presidio.filter_dict(payload[0], entity_types=entity_types) == expected[0]
+
+
+def test_field_allowlist_matches_reference(presidio):
+    """Test that only allowlisted keys (and containers under them) are filtered."""
+    payload = sample_payload()
+    fields = ['description', 'comments', 'body']
+
+    for entity_types in entity_lists(presidio):
+        expected = reference_filter(presidio, payload, entity_types, fields)
+        assert presidio.filter_list(payload, fields, entity_types) == expected
+
+
+def test_tuples_pass_through_and_input_untouched(presidio):
+    """Test that tuples are returned as-is and the input payload is not modified."""
+    payload = sample_payload()
+    original = sample_payload()
+
+    filtered = presidio.filter_list(payload, entity_types=presidio.critical_entities)
+
+    assert filtered[0]['comments'][0]['tags'] is payload[0]['comments'][0]['tags']
+    assert payload == original
+
+
+def test_nested_lists_are_filtered(presidio):
+    """Test that lists directly inside lists are descended into."""
+    filtered = presidio.filter_list([[SAMPLE_TEXTS[0]], {'rows': [[SAMPLE_TEXTS[1]]]}],
+                                    entity_types=presidio.critical_entities)
+
+    assert filtered[0] == ["Card on file is <CREDIT_CARD>, please update it"]
+    assert filtered[1]['rows'] == [["Employee SSN <US_SSN> was entered in the wrong field"]]
+
+
+def test_str_subclasses_are_filtered(presidio):
+    """Test that str/dict subclasses are filtered like plain strings and dicts."""
+    class Text(str):
+        pass
+
+    class Record(dict):
+        pass
+
+    filtered = presidio.filter_dict({'a': Text(SAMPLE_TEXTS[0]), 'b': Record(c=SAMPLE_TEXTS[1])},
+                                    entity_types=presidio.critical_entities)
+
+    assert filtered['a'] == "Card on file is <CREDIT_CARD>, please update it"
+    assert filtered['b']['c'] == "Employee SSN <US_SSN> was entered in the wrong field"
+
+
+def test_prefiltered_strings_contain_no_entities(presidio):
+    """Test that every string the analyzer finds entities in passes the prefilter."""
+    corpus = SAMPLE_TEXTS + [
+        "WA license SMITH**J*2AB on file",
+        "IPv6 fe80::1ff:fe23:4567:890a on the switch",
+        "Call 555 0143 tomorrow",
+        "No numbers or symbols here at all",
+    ]
+
+    for entity_types in entity_lists(presidio):
+        prefilter = presidio._get_prefilter(entity_types)
+        if prefilter is None:
+            continue
+        for text in corpus:
+            if presidio.analyzer.analyze(text=text, language='en', entities=entity_types):
+                assert prefilter.search(text), text
+
+
+def test_pattern_recognizers_match_analyzer(presidio):
+    """Test that the regex-only path finds the same entities as the analyzer."""
+    entity_types = presidio.critical_entities
+    assert presidio._get_pattern_recognizers(entity_types) is not None
+
+    def spans(results):
+        return sorted((r.entity_type, r.start, r.end) for r in results)
+
+    for text in SAMPLE_TEXTS:
+        expected = presidio.analyzer.analyze(text=text, language='en', entities=entity_types)
+        assert spans(presidio.analyze_text(text, entity_types)) == spans(expected), text
+
+
+def test_pattern_recognizer_overlaps_redacted(presidio):
+    """
+    Test how the regex-only path resolves matches for different entities on one span.
+
+    Without context enhancement its scores never exceed the analyzer's, so the
+    label chosen for an overlap may differ, but the whole span is always redacted.
+    """
+    entity_types = presidio.critical_entities
+
+    for text in ["ssn 536228726", "passport 536228726", "536228726"]:
+        fast = presidio.analyze_text(text, entity_types)
+        full = presidio.analyzer.analyze(text=text, language='en', entities=entity_types)
+
+        full_scores = {(r.entity_type, r.start, r.end): r.score for r in full}
+        assert {(r.entity_type, r.start, r.end) for r in fast} == set(full_scores)
+        for r in fast:
+            assert r.score <= full_scores[(r.entity_type, r.start, r.end)]
+
+        start, end = {(r.start, r.end) for r in full}.pop()
+        assert len({(r.start, r.end) for r in full}) == 1
+        assert presidio.anonymize_text(text, entity_types) in {
+            f"{text[:start]}<{r.entity_type}>{text[end:]}" for r in full
+        }
+
+
+def test_duplicate_strings_anonymized_consistently(presidio):
+    """Test that repeated strings get the same output, with and without a shared cache."""
+    payload = [{'subject': text, 'copy': text} for text in SAMPLE_TEXTS] * 3
+
+    for entity_types in entity_lists(presidio):
+        expected = [presidio.anonymize_text(text, entity_types) for text in SAMPLE_TEXTS] * 3
+
+        uncached = presidio.filter_list(payload, entity_types=entity_types)
+        assert [item['subject'] for item in uncached] == expected
+        assert [item['copy'] for item in uncached] == expected
+
+        cache = {}
+        first = presidio.filter_list(payload, entity_types=entity_types, cache=cache)
+        second = presidio.filter_list(payload, entity_types=entity_types, cache=cache)
+        assert first == second == uncached
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Test the response caches and conditional GET handling.
+
+This test validates that:
+- TTLCache entries expire after their TTL and the least recently used entry is evicted
+- Proxied responses carry an ETag and answer a matching If-None-Match with 304
+- conditional_json answers a matching If-None-Match with 304
+- Only successful upstream responses are cached
+"""
+
+import pytest
+
+pytest.importorskip('presidio_analyzer')
+pytest.importorskip('flask_compress')
+
+import orjson
+
+from app import response_cache
+from app.response_cache import TTLCache
+
+
+class FakeClock:
+    """Stand-in for time.monotonic that only moves when advanced."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class FakeResponse:
+    """Minimal requests.Response returned by the fake call_service."""
+
+    def __init__(self, status_code, data):
+        self.status_code = status_code
+        self.content = orjson.dumps(data)
+        self.text = self.content.decode('utf-8')
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Freeze the clock the caches use for expiry."""
+    clock = FakeClock()
+    monkeypatch.setattr(response_cache.time, 'monotonic', clock)
+    return clock
+
+
+@pytest.fixture
+def routes(monkeypatch):
+    """app.routes with upstream calls recorded and filtering passed through."""
+    from app import routes
+
+    monkeypatch.setattr(routes, 'apply_company_filtering', lambda data, *args, **kwargs: data)
+    routes._proxy_cache.clear()
+    yield routes
+    routes._proxy_cache.clear()
+
+
+def fake_upstream(routes, monkeypatch, responses):
+    """Serve responses in order from call_service and return the list of calls made."""
+    calls = []
+
+    def call_service(service, endpoint, **kwargs):
+        calls.append((service, endpoint, kwargs.get('params')))
+        return responses[len(calls) - 1]
+
+    monkeypatch.setattr(routes, 'call_service', call_service)
+    return calls
+
+
+def proxy_get(routes, headers=None, cache_ttl=30):
+    """Call proxy_service_get for a Codex list endpoint in a request context."""
+    with routes.app.test_request_context('/api/codex/companies', headers=headers or {}):
+        response = routes.proxy_service_get(
+            'codex', '/api/companies', 'Codex companies retrieval', 'Failed to retrieve companies',
+            params={'limit': 10}, cache_ttl=cache_ttl
+        )
+        if isinstance(response, tuple):
+            body, status = response
+            body.status_code = status
+            return body
+        return response
+
+
+def test_ttl_expiry(clock):
+    """Test that entries are served until their TTL and dropped after it."""
+    cache = TTLCache(maxsize=10, ttl=30)
+    cache.set('a', 1)
+    cache.set('b', 2, ttl=5)
+
+    clock.advance(4.9)
+    assert cache.get('a') == 1
+    assert cache.get('b') == 2
+
+    clock.advance(0.1)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+
+    clock.advance(25)
+    assert cache.get('a', 'missing') == 'missing'
+    assert len(cache) == 0
+
+
+def test_lru_eviction(clock):
+    """Test that the least recently used entry is evicted when the cache is full."""
+    cache = TTLCache(maxsize=2, ttl=30)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+
+
+def test_proxy_etag_and_304(routes, monkeypatch, clock):
+    """Test that a matching If-None-Match gets a 304 from cache."""
+    calls = fake_upstream(routes, monkeypatch, [FakeResponse(200, [{'id': 1}])])
+
+    first = proxy_get(routes)
+    assert first.status_code == 200
+    assert orjson.loads(first.get_data()) == {'data': [{'id': 1}]}
+    etag = first.headers['ETag']
+
+    second = proxy_get(routes, headers={'If-None-Match': etag})
+    assert second.status_code == 304
+    assert second.headers['ETag'] == etag
+
+    stale = proxy_get(routes, headers={'If-None-Match': '"other"'})
+    assert stale.status_code == 200
+    assert len(calls) == 1
+
+
+def test_proxy_cache_expires(routes, monkeypatch, clock):
+    """Test that a cached proxy response is refetched after its TTL."""
+    calls = fake_upstream(routes, monkeypatch, [
+        FakeResponse(200, [{'id': 1}]),
+        FakeResponse(200, [{'id': 2}]),
+    ])
+
+    proxy_get(routes, cache_ttl=30)
+    clock.advance(31)
+    response = proxy_get(routes, cache_ttl=30)
+
+    assert orjson.loads(response.get_data()) == {'data': [{'id': 2}]}
+    assert len(calls) == 2
+
+
+@pytest.mark.parametrize('status_code', [404, 429, 500, 503])
+def test_non_200_upstream_not_cached(routes, monkeypatch, clock, status_code):
+    """Test that upstream errors are passed on and never cached."""
+    calls = fake_upstream(routes, monkeypatch, [
+        FakeResponse(status_code, {'error': 'nope'}),
+        FakeResponse(200, [{'id': 1}]),
+    ])
+
+    failed = proxy_get(routes)
+    assert failed.status_code == status_code
+    assert orjson.loads(failed.get_data()) == {'error': 'Failed to retrieve companies'}
+    assert len(routes._proxy_cache) == 0
+
+    recovered = proxy_get(routes)
+    assert recovered.status_code == 200
+    assert len(calls) == 2
+
+
+def test_conditional_json_304():
+    """Test that conditional_json answers a matching If-None-Match with 304."""
+    from app import routes
+
+    with routes.app.test_request_context('/'):
+        etag = routes.conditional_json({'a': 1}).headers['ETag']
+
+    with routes.app.test_request_context('/', headers={'If-None-Match': etag}):
+        assert routes.conditional_json({'a': 1}).status_code == 304
+
+    with routes.app.test_request_context('/', headers={'If-None-Match': etag}):
+        assert routes.conditional_json({'a': 2}).status_code == 200
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test the pooled upstream session in service_client.
+
+This test validates that:
+- A read timeout is raised on the first attempt and never retried
+- Failed connection attempts are retried
+- Upstream calls are counted per calling route, with 4xx and 5xx kept apart
+"""
+
+import socket
+import threading
+
+import pytest
+
+pytest.importorskip('presidio_analyzer')
+pytest.importorskip('flask_compress')
+
+import requests
+
+from app import app, service_client
+
+
+@pytest.fixture
+def stalled_server():
+    """A local server that accepts requests and never answers; yields (url, requests seen)."""
+    server = socket.socket()
+    server.bind(('127.0.0.1', 0))
+    server.listen(8)
+    seen = []
+    stop = threading.Event()
+
+    def serve():
+        server.settimeout(0.1)
+        connections = []
+        while not stop.is_set():
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                continue
+            connections.append(conn)
+            conn.settimeout(1)
+            try:
+                if conn.recv(65536):
+                    seen.append(conn)
+            except socket.timeout:
+                pass
+        for conn in connections:
+            conn.close()
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.getsockname()[1]}", seen
+    stop.set()
+    thread.join()
+    server.close()
+
+
+def test_read_timeout_not_retried(stalled_server):
+    """Test that a stalled upstream GET fails after a single read timeout."""
+    url, seen = stalled_server
+
+    with pytest.raises(requests.ReadTimeout):
+        service_client._session.get(f"{url}/api/companies", timeout=(1, 0.3))
+
+    assert len(seen) == 1
+
+
+def test_connect_errors_retried():
+    """Test that the session's retry policy covers connection errors only."""
+    retry = service_client._adapter.max_retries
+
+    assert retry.connect == 2
+    assert retry.read is False
+    assert retry.status == 0
+
+
+class FakeSession:
+    """Stand-in for the pooled session: returns the given status codes in order."""
+
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+
+    def request(self, method, url, headers, **kwargs):
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+
+        class Response:
+            status_code = outcome
+
+        return Response()
+
+
+def test_call_stats_by_route_and_status(monkeypatch):
+    """Test that calls are labeled by route and errors split into 4xx, 5xx and timeouts."""
+    monkeypatch.setitem(app.config, 'SERVICES', {'ledger': {'url': 'http://ledger'}})
+    monkeypatch.setattr(service_client, '_call_stats', {})
+    monkeypatch.setattr(service_client, '_get_cached_token', lambda service_name: 'token')
+    monkeypatch.setattr(service_client, '_session', FakeSession(
+        [200, 404, 503, requests.ReadTimeout('read timed out'), 200]
+    ))
+
+    with app.test_request_context('/api/ledger/billing/bulk', method='POST'):
+        for _ in range(3):
+            service_client.call_service('ledger', '/api/billing/1')
+        with pytest.raises(requests.ReadTimeout):
+            service_client.call_service('ledger', '/api/billing/1')
+
+    with app.app_context():
+        service_client.call_service('ledger', '/api/billing/1')
+
+    stats = service_client.get_call_stats()['ledger']
+    assert set(stats) == {'ledger_billing_bulk', 'background'}
+    assert stats['ledger_billing_bulk']['count'] == 4
+    assert stats['ledger_billing_bulk']['errors'] == {
+        'http_4xx': 1, 'http_5xx': 1, 'timeout': 1
+    }
+    assert stats['background']['count'] == 1
+    assert stats['background']['errors'] == {}